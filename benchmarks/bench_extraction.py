@@ -0,0 +1,55 @@
+"""
+Micro-benchmark: BeautifulSoup ("soup") vs streaming ("fast") skills-table extraction.
+
+Runs both parsers over every saved RunePixels skills page in benchmarks/fixtures/ (drop real
+saved pages in there to benchmark against them), checks they extract identical data, and
+reports per-page timings.
+
+Usage: python benchmarks/bench_extraction.py [--repeat 50]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bot # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PARSERS = {"soup": bot.parse_dxp_table_soup, "fast": bot.parse_dxp_table_stream}
+
+def time_parser(parser, page_source: str, repeat: int):
+    """Returns per-call timings (seconds) for `repeat` runs of parser over page_source."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(page_source, "bench")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=50, help="Parses per page per parser (default 50).")
+    args = arg_parser.parse_args()
+
+    pages = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}."); return 1
+    for path in pages:
+        with open(path, encoding="utf-8") as f: page_source = f.read()
+        results = {name: parser(page_source, "bench") for name, parser in PARSERS.items()}
+        if results["soup"] != results["fast"]:
+            print(f"MISMATCH in {os.path.basename(path)}:\n  soup={results['soup']}\n  fast={results['fast']}"); return 1
+        print(f"{os.path.basename(path)} ({len(page_source) / 1024:.0f} KiB, {len(results['fast'])} skills)")
+        medians = {}
+        for name, parser in PARSERS.items():
+            timings = time_parser(parser, page_source, args.repeat)
+            medians[name] = statistics.median(timings)
+            print(f"  {name:<5} median {medians[name] * 1000:8.3f} ms   min {min(timings) * 1000:8.3f} ms")
+        print(f"  speedup: {medians['soup'] / medians['fast']:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
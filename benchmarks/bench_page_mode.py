@@ -0,0 +1,86 @@
+"""
+Selenium page-mode benchmark: "full" vs "lean" (CHROME_LEAN_MODE) page loads, fully offline.
+
+Loads the recorded skills page from a local FakeRunePixelsServer through the bot's own
+SeleniumDxpFetcher and driver pool, once per mode, and reports per-page load/readiness/total
+time, how many images/fonts/stylesheets the server had to serve, and driver memory per page
+(real Chrome RSS with psutil installed, otherwise the page's JS heap). Needs Chrome and
+ChromeDriver, as the bot does.
+
+Usage: python benchmarks/bench_page_mode.py [--pages 20] [--latency 0.05] [--asset-latency 0.05] [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bot # noqa: E402
+from fake_runepixels import FakeRunePixelsServer, DEFAULT_FIXTURE # noqa: E402
+
+MODES = {"full": False, "lean": True}
+
+def driver_memory_mb(pool):
+    """Memory of the pool's (single) idle driver, or None if unknown."""
+    pooled = pool.checkout()
+    try: return bot._driver_memory_mb(pooled.driver)
+    finally: pool.checkin(pooled)
+
+def run_mode(mode: str, server, pages: int):
+    bot.CHROME_LEAN_MODE = MODES[mode]
+    bot.STATS = bot.BotStats(bot.STATS_WINDOW) # Per-mode stage timings
+    bot.DRIVER_POOL = bot.ChromeDriverPool(1) # New drivers pick up the mode's Chrome options
+    fetcher = bot.SeleniumDxpFetcher()
+    try:
+        fetcher.fetch("Warmup Player") # Driver startup isn't part of a page load
+        bot.STATS = bot.BotStats(bot.STATS_WINDOW)
+        assets_before, totals, memory = server.requests["assets"], [], []
+        for i in range(pages):
+            start = time.perf_counter()
+            if fetcher.fetch(f"Bench Player {i}")[0] is None: print(f"  {mode}: page {i} returned no data", file=sys.stderr)
+            totals.append(time.perf_counter() - start)
+            memory.append(driver_memory_mb(bot.DRIVER_POOL))
+        stage = lambda name: {k: round(v * 1000, 1) if k != 'count' else v for k, v in (bot.STATS.stage_summary(name) or {}).items()}
+        memory = [m for m in memory if m is not None]
+        return {"mode": mode, "pages": pages,
+                "page_ms": {"median": round(statistics.median(totals) * 1000, 1), "max": round(max(totals) * 1000, 1)},
+                "page_load_ms": stage("page_load"), "page_ready_ms": stage("page_ready"),
+                "assets_per_page": round((server.requests["assets"] - assets_before) / pages, 1),
+                "memory_mb": {"median": round(statistics.median(memory), 1), "max": round(max(memory), 1),
+                              "source": "chrome_rss" if bot.psutil else "js_heap"} if memory else None}
+    finally:
+        fetcher.close()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--pages", type=int, default=20, help="Timed page loads per mode.")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Fake server latency per skills page (seconds).")
+    arg_parser.add_argument("--asset-latency", type=float, default=0.05, help="Fake server latency per image/font/stylesheet (seconds).")
+    arg_parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    arg_parser.add_argument("--output", help="Also write the results as JSON here.")
+    arg_parser.add_argument("--verbose", action="store_true", help="Keep the bot's own log output.")
+    args = arg_parser.parse_args()
+
+    if not args.verbose: bot.print = lambda *a, **k: None
+    results = []
+    with FakeRunePixelsServer(args.fixture, args.latency, asset_latency=args.asset_latency) as server:
+        bot.RUNEPIXELS_BASE_URL = server.base_url
+        for mode in MODES:
+            try: result = run_mode(mode, server, args.pages)
+            except bot.WebDriverException as e:
+                print(f"Could not start Chrome (is Chrome/ChromeDriver installed?): {e.msg}"); return 1
+            results.append(result)
+            memory = result["memory_mb"]
+            memory_text = f"{memory['median']} MB ({memory['source']})" if memory else "unknown"
+            print(f"{mode:<5} page median {result['page_ms']['median']:8.1f} ms (load {result['page_load_ms'].get('p50')} ms, "
+                  f"ready {result['page_ready_ms'].get('p50')} ms), {result['assets_per_page']:5.1f} assets/page, memory {memory_text}")
+    full, lean = results
+    print(f"lean vs full: {full['page_ms']['median'] / lean['page_ms']['median']:.2f}x faster per page")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
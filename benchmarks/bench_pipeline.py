@@ -0,0 +1,228 @@
+"""
+End-to-end /getdxp benchmark: fetch -> parse -> Skill Best -> embed build, fully offline.
+
+Registers a synthetic roster, serves every player's page from a local FakeRunePixelsServer
+(configurable latency/jitter), and drives the same code /getdxp uses: fetch_dxp_for_command
+(cache bypassed), build_leaderboard_embed and build_skill_best_embed. Reports per-player fetch
+latency p50/p95, end-to-end time, throughput, peak RSS and the bot's own per-stage timings as
+JSON so runs can be diffed. Peak RSS covers the whole process tree (bot, process-mode workers,
+chromedriver and Chrome) when psutil is installed, and only this Python process otherwise;
+meta.rss_source says which.
+
+Usage: python benchmarks/bench_pipeline.py [--sizes 10 50 250] [--runs 3] [--warmup 1] [--latency 0.05] [--jitter 0.02]
+                                           [--backend http] [--worker-mode thread] [--output results.json]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import psutil # Optional: peak RSS of the whole process tree instead of just this process
+except ImportError:
+    psutil = None
+try:
+    import resource # Unix only; without it (or psutil) peak RSS is reported as null
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bot # noqa: E402
+from fake_runepixels import FakeRunePixelsServer, DEFAULT_FIXTURE # noqa: E402
+
+class FakeUser:
+    def __init__(self, user_id: int): self.display_name = f"Member{user_id}"
+
+class FakeDiscordBot:
+    """Just enough of commands.Bot for display-name resolution: empty gateway caches, instant fetch_user."""
+    guilds = []
+    def get_user(self, user_id): return None
+    async def fetch_user(self, user_id): return FakeUser(user_id)
+
+def percentile(samples, q: float):
+    if not samples: return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+RSS_SOURCE = "process_tree" if psutil else "python_only" if resource else None
+
+class PeakRssSampler:
+    """
+    Context manager that polls the summed RSS of this process and all its descendants every `interval`
+    seconds from a background thread, keeping the peak. Per-process maxima can't simply be added up
+    (they peak at different times, and ru_maxrss for children only reports the largest one), so the
+    tree is sampled while it runs. Without psutil, peak_mb() is this process's own ru_maxrss.
+    """
+    def __init__(self, interval: float = 0.05):
+        self.interval, self._peak = interval, 0
+        self._stop, self._thread = threading.Event(), None
+
+    def _tree_rss(self) -> int:
+        root, total = psutil.Process(), 0
+        for proc in [root] + root.children(recursive=True):
+            try: total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied): pass # Exited (or not ours) since listing
+        return total
+
+    def _poll(self):
+        while True:
+            self._peak = max(self._peak, self._tree_rss())
+            if self._stop.wait(self.interval): return
+
+    def __enter__(self):
+        if psutil:
+            self._thread = threading.Thread(target=self._poll, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread:
+            self._stop.set(); self._thread.join()
+
+    def peak_mb(self):
+        if psutil: return round(self._peak / (1024 * 1024), 1)
+        if resource is None: return None
+        scale = 1 if sys.platform == "darwin" else 1024 # ru_maxrss is bytes on macOS, KiB on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024), 1)
+
+def _quiet_worker_init(config: dict, rate_limiter, verbose: bool):
+    """Process-mode initializer: bot's own worker setup, minus its logging (which would land in the JSON on stdout)."""
+    if not verbose: bot.print = lambda *a, **k: None
+    bot._scrape_process_init(config, rate_limiter)
+
+def configure_bot(args, base_url: str, work_dir: str):
+    """Points the bot at the fake server and at throwaway data files."""
+    bot.RUNEPIXELS_BASE_URL = base_url
+    bot.FETCH_BACKENDS = list(args.backend)
+    bot.CHROME_LEAN_MODE = args.chrome_mode == "lean"
+    bot.FETCHERS = [bot._FETCHER_FACTORIES[name]() for name in bot.FETCH_BACKENDS]
+    bot.RUNEPIXELS_RATE_LIMITER = bot.TokenBucket(args.rate_limit, args.rate_burst)
+    bot.SCRAPE_WORKER_MODE = args.worker_mode
+    bot.SCRAPE_EXECUTOR = bot._create_scrape_executor() # After the config above, so process workers inherit it
+    if args.worker_mode == "process":
+        bot.SCRAPE_EXECUTOR.shutdown()
+        config = {name: getattr(bot, name) for name in bot._WORKER_CONFIG_NAMES}
+        bot.SCRAPE_EXECUTOR = bot.concurrent.futures.ProcessPoolExecutor(
+            max_workers=bot.SCRAPE_PROCESS_WORKERS, mp_context=bot.multiprocessing.get_context("spawn"),
+            initializer=_quiet_worker_init, initargs=(config, bot.RUNEPIXELS_RATE_LIMITER, args.verbose))
+    bot.SCRAPE_CONCURRENCY = bot.SCRAPE_PROCESS_WORKERS if args.worker_mode == "process" else bot.MAX_CONCURRENT_PLAYERS
+    bot.SNAPSHOT_STORE = bot.DxpSnapshotStore(os.path.join(work_dir, "snapshots.db"))
+
+def use_roster(work_dir: str, rsns: list):
+    """Swaps in a fresh registry holding just `rsns` (set_players merges, so reuse would keep earlier rosters)."""
+    if bot.REGISTRY.players_file.startswith(work_dir):
+        bot.REGISTRY.flush() # Don't leave a write-behind timer pointing at the temp dir
+    bot.REGISTRY = bot.BotRegistry(os.path.join(work_dir, f"players_{len(rsns)}.json"), os.path.join(work_dir, "admins.json"))
+    bot.REGISTRY.set_players({str(10_000 + i): {"rsn": rsn} for i, rsn in enumerate(rsns)})
+
+async def run_pipeline(discord_bot, players: int):
+    """One /getdxp-equivalent run. Returns a result dict with timings in milliseconds."""
+    latencies = []
+    real_scrape_player = bot.scrape_player
+    async def timed_scrape_player(rsn, report=None):
+        start = time.perf_counter()
+        try: return await real_scrape_player(rsn, report)
+        finally: latencies.append(time.perf_counter() - start)
+    bot.scrape_player = timed_scrape_player
+    try:
+        with PeakRssSampler() as rss:
+            start = time.perf_counter()
+            results = await bot.fetch_dxp_for_command(discord_bot, force=True)
+            fetched = time.perf_counter()
+            now = datetime.datetime.now(datetime.timezone.utc)
+            bot.build_leaderboard_embed(results, now)
+            leaderboard_built = time.perf_counter()
+            bot.build_skill_best_embed(results, now)
+            finished = time.perf_counter()
+    finally:
+        bot.scrape_player = real_scrape_player
+    ok = sum(1 for r in results.values() if r.get('dxp_data') is not None)
+    return {
+        "players": players, "ok": ok,
+        "total_ms": round((finished - start) * 1000, 2),
+        "fetch_ms": round((fetched - start) * 1000, 2),
+        "leaderboard_embed_ms": round((leaderboard_built - fetched) * 1000, 2),
+        "skill_best_embed_ms": round((finished - leaderboard_built) * 1000, 2),
+        "player_latency_ms": {"p50": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+                              "p95": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None},
+        "throughput_players_per_s": round(ok / (fetched - start), 2) if fetched > start else None,
+        "peak_rss_mb": rss.peak_mb(),
+    }
+
+def summarize(runs: list):
+    totals = [r["total_ms"] for r in runs]
+    return {"players": runs[0]["players"], "runs": len(runs),
+            "total_ms_p50": percentile(totals, 0.50), "total_ms_p95": percentile(totals, 0.95),
+            "player_latency_ms_p50": statistics.median(r["player_latency_ms"]["p50"] for r in runs),
+            "player_latency_ms_p95": max(r["player_latency_ms"]["p95"] for r in runs),
+            "throughput_players_per_s": statistics.median(r["throughput_players_per_s"] for r in runs),
+            "peak_rss_mb": max((r["peak_rss_mb"] or 0) for r in runs) or None}
+
+async def main_async(args):
+    results, summaries = [], []
+    with FakeRunePixelsServer(args.fixture, args.latency, args.jitter) as server, tempfile.TemporaryDirectory() as work_dir:
+        configure_bot(args, server.base_url, work_dir)
+        discord_bot = FakeDiscordBot()
+        for _ in range(args.warmup): # Starts workers and opens keep-alive connections; not reported
+            use_roster(work_dir, ["Warmup Player"])
+            await run_pipeline(discord_bot, 1)
+        for size in args.sizes:
+            use_roster(work_dir, [f"Bench Player {i}" for i in range(size)])
+            size_runs = []
+            for run in range(args.runs):
+                result = await run_pipeline(discord_bot, size)
+                result["run"] = run
+                size_runs.append(result)
+                print(f"{size:>4} players, run {run + 1}: total {result['total_ms']:9.1f} ms, fetch p50/p95 "
+                      f"{result['player_latency_ms']['p50']}/{result['player_latency_ms']['p95']} ms, "
+                      f"{result['throughput_players_per_s']} players/s", file=sys.stderr)
+            results += size_runs
+            summaries.append(summarize(size_runs))
+        bot.REGISTRY.flush()
+        server_requests = dict(server.requests)
+    bot.SCRAPE_EXECUTOR.shutdown()
+    return {
+        "meta": {"timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(), "python": platform.python_version(),
+                 "platform": platform.platform(), "fixture": os.path.basename(args.fixture), "latency_s": args.latency,
+                 "jitter_s": args.jitter, "backends": args.backend, "chrome_mode": args.chrome_mode, "worker_mode": args.worker_mode,
+                 "concurrency": bot.SCRAPE_CONCURRENCY, "extraction_mode": bot.DXP_EXTRACTION_MODE,
+                 "skill_best_solver": bot.SKILL_BEST_SOLVER, "rss_source": RSS_SOURCE, "server_requests": server_requests},
+        "summary": summaries,
+        "stages": bot.STATS.summary(), # The bot's own per-stage timings (see /botstats), over the last STATS_WINDOW samples
+        "runs": results,
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 250], help="Roster sizes (default 10 50 250).")
+    arg_parser.add_argument("--runs", type=int, default=3, help="Runs per roster size.")
+    arg_parser.add_argument("--warmup", type=int, default=1, help="Unreported warm-up runs before timing.")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Fake server latency per page (seconds).")
+    arg_parser.add_argument("--jitter", type=float, default=0.02, help="Random +/- latency (seconds).")
+    arg_parser.add_argument("--backend", nargs="+", default=["http"], choices=["http", "selenium"], help="FETCH_BACKENDS to use.")
+    arg_parser.add_argument("--chrome-mode", default="full", choices=["lean", "full"], help="CHROME_LEAN_MODE for the selenium backend.")
+    arg_parser.add_argument("--worker-mode", default="thread", choices=["thread", "process"])
+    arg_parser.add_argument("--rate-limit", type=float, default=None, help="Requests/second (default: unlimited).")
+    arg_parser.add_argument("--rate-burst", type=int, default=4)
+    arg_parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    arg_parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    arg_parser.add_argument("--verbose", action="store_true", help="Keep the bot's own log output.")
+    args = arg_parser.parse_args()
+
+    if not args.verbose: bot.print = lambda *a, **k: None
+    report = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2); print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Skill Best solver benchmark: "indexed" vs the original "v13" logic.
+
+Times both solvers on randomized rosters at each roster size. The bot parses DXP strings into
+DxpRecords once at scrape time, so "indexed" is timed on pre-parsed records; "+parse" also counts
+that parsing, for a like-for-like comparison with v13, which parses the strings itself. That both give identical results
+(ties, placeholders, missing skills, player names containing skill names) is checked by
+tests/test_skill_best.py, which reuses random_roster() and solve() from here.
+
+Usage: python benchmarks/bench_skill_best.py [--sizes 10 100 1000] [--v13-max-players 1000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bot # noqa: E402
+
+SKILLS = ["Overall", "Attack", "Defence", "Strength", "Constitution", "Ranged", "Prayer", "Magic", "Cooking",
+          "Woodcutting", "Fletching", "Fishing", "Firemaking", "Crafting", "Smithing", "Mining", "Herblore",
+          "Agility", "Thieving", "Slayer", "Farming", "Runecrafting", "Hunter", "Construction", "Summoning",
+          "Dungeoneering", "Divination", "Invention", "Archaeology", "Necromancy"]
+
+def random_roster(rng: random.Random, players: int, dxp_range: int = 5_000_000):
+    """Builds {discord_name: {skill: dxp_str}} in the shape fetch_dxp_for_command produces."""
+    roster = {}
+    for i in range(players):
+        # Some names contain skill names, which exercises a quirk of the v13 logic
+        name = f"{rng.choice(SKILLS).lower()}fan{i}" if rng.random() < 0.2 else f"Player{i:04d}"
+        strength = rng.paretovariate(1.2) # A few heavy grinders top most skills, as in real clans
+        dxp_data = {}
+        for skill in SKILLS:
+            roll = rng.random()
+            if roll < 0.05: continue # Skill missing from the table
+            if roll < 0.25: dxp_data[skill] = bot.NO_DATA_PLACEHOLDER
+            else: dxp_data[skill] = f"{int(strength * rng.randrange(0, dxp_range)):,}" # Small ranges produce ties
+        roster[name] = dxp_data
+    return roster
+
+def to_records(roster):
+    """Parses a raw roster into the DxpRecords the bot hands the indexed solver."""
+    return {name: bot.DxpRecord.from_raw(dxp_data) for name, dxp_data in roster.items()}
+
+def solve(solver, roster, records=None):
+    """Runs one solver as build_skill_best_embed does: v13 on raw strings, indexed on pre-parsed DxpRecords."""
+    all_skill_names = set(s.lower().strip() for p_data in roster.values() if p_data for s in p_data)
+    data = roster if solver is bot.calculate_skill_best_assignments_v13 else (records or to_records(roster))
+    return solver(data, list(all_skill_names - {"overall"}))
+
+def time_solver(solver, roster, repeat: int, include_parsing: bool = False):
+    records = to_records(roster) # Parsing happens once at scrape time in the bot, so by default it isn't timed here
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solve(solver, roster, None if include_parsing else records)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Roster sizes to time.")
+    arg_parser.add_argument("--v13-max-players", type=int, default=1000, help="Skip timing v13 above this roster size.")
+    arg_parser.add_argument("--repeat", type=int, default=7)
+    arg_parser.add_argument("--seed", type=int, default=13)
+    args = arg_parser.parse_args()
+
+    bot.print = lambda *a, **k: None # Silence the solvers' progress logging
+    try:
+        for size in args.sizes:
+            roster = random_roster(random.Random(args.seed + size), size)
+            indexed = time_solver(bot.calculate_skill_best_assignments_indexed, roster, args.repeat)
+            parsed = time_solver(bot.calculate_skill_best_assignments_indexed, roster, args.repeat, include_parsing=True)
+            line = f"{size:>5} players: indexed {indexed * 1000:9.2f} ms   +parse {parsed * 1000:9.2f} ms"
+            if size <= args.v13_max_players:
+                v13 = time_solver(bot.calculate_skill_best_assignments_v13, roster, args.repeat)
+                line += f"   v13 {v13 * 1000:10.2f} ms   speedup {v13 / indexed:5.1f}x ({v13 / parsed:.1f}x incl. parsing)"
+            print(line)
+    finally:
+        del bot.print
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Stand-in RunePixels server for offline benchmarks.
+
+Serves a recorded skills page (benchmarks/fixtures/) for every /players/<rsn>/skills URL, with
+deterministic per-RSN DXP values so leaderboards and Skill Best have something to rank, plus
+configurable latency and jitter. RSNs starting with "Missing" get a 404. Any other path (images,
+fonts, scripts referenced by the page) returns a small placeholder body.
+
+Run on its own: python benchmarks/fake_runepixels.py --port 8765 --latency 0.2 --jitter 0.05
+then set RUNEPIXELS_BASE_URL = "http://127.0.0.1:8765" in bot.py.
+"""
+import argparse
+import gzip
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_FIXTURE = os.path.join(FIXTURES_DIR, "runepixels_skills_sample.html")
+_PLAYER_PATH = re.compile(r"^/players/([^/]+)/skills/?$")
+_ROW = re.compile(r"<tr\b.*?</tr>", re.S)
+_CELL = re.compile(r"(<td\b[^>]*>)(.*?)(</td>)", re.S)
+_ASSET_TYPES = {".png": "image/png", ".webp": "image/webp", ".jpg": "image/jpeg", ".woff2": "font/woff2",
+                ".css": "text/css", ".js": "application/javascript"}
+
+class SkillsPageTemplate:
+    """A recorded skills page split around each row's DXP cell (td index 6), so rendering one RSN is a join."""
+    def __init__(self, page_source: str):
+        table_start = page_source.index("<app-table")
+        table_end = page_source.index("</app-table>", table_start)
+        self.parts, cursor = [], 0
+        for row in _ROW.finditer(page_source, table_start, table_end):
+            cells = list(_CELL.finditer(page_source, row.start(), row.end()))
+            if len(cells) > 6:
+                self.parts.append(page_source[cursor:cells[6].start(2)])
+                cursor = cells[6].end(2)
+        self.parts.append(page_source[cursor:])
+
+    @property
+    def skill_count(self) -> int:
+        return len(self.parts) - 1
+
+    def render(self, rsn: str) -> str:
+        rng = random.Random(rsn.lower()) # Same RSN, same page
+        strength = rng.paretovariate(1.2)
+        values = ["--" if rng.random() < 0.15 else f"{int(strength * rng.randrange(0, 2_000_000)):,}" for _ in range(self.skill_count)]
+        out = [self.parts[0]]
+        for value, part in zip(values, self.parts[1:]): out += [value, part]
+        return "".join(out)
+
+class FakeRunePixelsServer:
+    """Threaded HTTP server; use as a context manager or call start()/stop(). `base_url` is set once started."""
+    def __init__(self, fixture_path: str = DEFAULT_FIXTURE, latency: float = 0.0, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, asset_latency: float = None):
+        with open(fixture_path, encoding="utf-8") as f: self.template = SkillsPageTemplate(f.read())
+        self.latency, self.jitter = latency, jitter
+        self.asset_latency = latency if asset_latency is None else asset_latency
+        self.requests = {"pages": 0, "assets": 0, "not_found": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+        self.base_url = None
+
+    def _count(self, key: str):
+        with self._lock: self.requests[key] += 1
+
+    def _sleep(self, latency: float):
+        delay = latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0: time.sleep(delay)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, as the real site
+
+            def do_GET(self):
+                path = urllib.parse.urlsplit(self.path).path
+                match = _PLAYER_PATH.match(path)
+                if match:
+                    server._sleep(server.latency)
+                    rsn = urllib.parse.unquote(match.group(1))
+                    if rsn.lower().startswith("missing"):
+                        server._count("not_found")
+                        return self._send(404, b"Player not found", "text/plain")
+                    server._count("pages")
+                    return self._send(200, server.template.render(rsn).encode("utf-8"), "text/html; charset=utf-8")
+                server._sleep(server.asset_latency)
+                server._count("assets")
+                self._send(200, b"\0" * 2048, _ASSET_TYPES.get(os.path.splitext(path)[1], "application/octet-stream"))
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                if "gzip" in self.headers.get("Accept-Encoding", "") and content_type.startswith("text/html"):
+                    body = gzip.compress(body, compresslevel=5)
+                    gzipped = True
+                else: gzipped = False
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if gzipped: self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args): pass # Keep benchmark output clean
+
+        return Handler
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-runepixels", daemon=True)
+        self._thread.start()
+        host, port = self._httpd.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start(); return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each response.")
+    arg_parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds on top of --latency.")
+    arg_parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    args = arg_parser.parse_args()
+    server = FakeRunePixelsServer(args.fixture, args.latency, args.jitter, port=args.port)
+    print(f"Serving {os.path.basename(args.fixture)} at {server.start()}/players/<rsn>/skills (Ctrl+C to stop)")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
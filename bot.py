@@ -1,16 +1,33 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import time
 import json
+import csv
+import io
+import re
+import tempfile
+import asyncio
 import urllib.parse
+from html.parser import HTMLParser
 import datetime
 import os
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 import concurrent.futures
 import threading
+import multiprocessing
+import heapq
+from array import array
+import bisect
+import sqlite3
+import queue
+import contextlib
+import random
+import atexit
 
 import nextcord
-from nextcord.ext import commands
+from nextcord.ext import commands, tasks
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -19,11 +36,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+try:
+    import psutil # Optional: lets the driver pool measure real Chrome memory usage
+except ImportError:
+    psutil = None
+
 # --- Constants ---
 NO_DATA_PLACEHOLDER = "--"
 MAX_EMBED_FIELDS = 25       # Max fields per Discord embed
 MAX_EMBEDS_PER_MESSAGE = 10 # Max embeds Discord allows in a single message
 MAX_SKILLS_FOR_BEST_PLAYER = 3 # For the "Skill Best" calculation
+# Fixed skill ids (index = id) for DxpRecord; skills RunePixels adds later get the next free id at runtime
+SKILL_NAMES = ("Overall", "Attack", "Defence", "Strength", "Constitution", "Ranged", "Prayer", "Magic", "Cooking",
+               "Woodcutting", "Fletching", "Fishing", "Firemaking", "Crafting", "Smithing", "Mining", "Herblore",
+               "Agility", "Thieving", "Slayer", "Farming", "Runecrafting", "Hunter", "Construction", "Summoning",
+               "Dungeoneering", "Divination", "Invention", "Archaeology", "Necromancy")
 # --- End Constants ---
 
 # --- Configuration ---
@@ -39,12 +66,115 @@ HEADERS = {
 }
 # Full path to ChromeDriver. Set to None if chromedriver is in system PATH.
 WEBDRIVER_PATH = None 
+# Base URL for RunePixels player pages. Point at a local server to run offline against recorded responses.
+RUNEPIXELS_BASE_URL = "https://runepixels.com"
 
 # --- Bot Behavior Configuration ---
+# Player/admin changes are written to disk at most once per this many seconds (coalesced, atomic writes)
+REGISTRY_FLUSH_DELAY = 2.0
 # For /getdxp, determines how many players are scraped concurrently
 MAX_CONCURRENT_PLAYERS = 4
-# Seconds to wait for dynamic content on RunePixels after main table appears
+# How to decide a RunePixels page is ready once the main table appears:
+#   "content" - poll the DXP column until every value is filled in, or it stops changing with at least one numeric
+#               value (bounded by READINESS_TIMEOUT)
+#   "fixed"   - always sleep PAGE_LOAD_DELAY seconds (legacy behaviour)
+READINESS_MODE = "content"
+# Seconds to wait for dynamic content on RunePixels after main table appears ("fixed" mode)
 PAGE_LOAD_DELAY = 7 
+# Upper bound (seconds) on "content" readiness polling, and the interval between polls
+READINESS_TIMEOUT = 20
+READINESS_POLL_INTERVAL = 0.25
+# The DXP column counts as settled once it is unchanged for this many consecutive polls. A column of only "--"
+# placeholders (a player with no DXP this event, or a skeleton still loading) is accepted once settled and at least
+# PAGE_LOAD_DELAY seconds have passed, so idle players cost no more than the fixed wait did.
+READINESS_STABLE_POLLS = 4
+# Where scrapes run: "thread" (a thread pool inside the bot process) or "process" (a pool of SCRAPE_PROCESS_WORKERS
+# worker processes fed from a job queue, keeping parsing and Chrome orchestration off the bot's event loop)
+SCRAPE_WORKER_MODE = "thread"
+SCRAPE_PROCESS_WORKERS = max(2, (os.cpu_count() or 2) - 1)
+# Global token bucket for requests to runepixels.com: one token per page request (HTTP GET or browser page load, including
+# fallbacks and crash retries), shared by every scrape thread and worker process. Set RUNEPIXELS_RATE_LIMIT_PER_SECOND to None to disable.
+RUNEPIXELS_RATE_LIMIT_PER_SECOND = 2.0
+RUNEPIXELS_RATE_LIMIT_BURST = 4
+# /getdxp result cache, keyed by RSN. Results younger than DXP_CACHE_TTL_SECONDS are served as-is; older ones
+# are served immediately while a background refresh runs, up to DXP_CACHE_MAX_STALE_SECONDS, after which they are re-scraped.
+# While scheduled sweeps (or adaptive refresh) keep the roster up to date, the TTL is raised to cover their interval.
+DXP_CACHE_TTL_SECONDS = 300
+DXP_CACHE_MAX_STALE_SECONDS = 3600
+DXP_CACHE_MAX_ENTRIES = 1000 # Least recently used entries are evicted beyond this
+# Background roster sweeps: scrape every registered player on a schedule, store snapshots in SNAPSHOTS_DB_FILE
+# and keep the /getdxp cache warm. Enable during DXP events.
+SCHEDULED_SCRAPE_ENABLED = False
+SCHEDULED_SCRAPE_INTERVAL_MINUTES = 15
+# Adaptive refresh (used instead of fixed sweeps when enabled): every ADAPTIVE_TICK_SECONDS, scrape just the players that
+# are due. A player gaining DXP is due every ADAPTIVE_MIN_INTERVAL_SECONDS; each refresh without a gain doubles their
+# interval, up to ADAPTIVE_MAX_INTERVAL_SECONDS. At most ADAPTIVE_SCRAPE_BUDGET_PER_MINUTE scrapes start in any minute.
+ADAPTIVE_REFRESH_ENABLED = False
+ADAPTIVE_TICK_SECONDS = 30
+ADAPTIVE_MIN_INTERVAL_SECONDS = 300
+ADAPTIVE_MAX_INTERVAL_SECONDS = 3600
+ADAPTIVE_SCRAPE_BUDGET_PER_MINUTE = 20
+# Failed adaptive refreshes retry after a jittered exponential backoff starting at ADAPTIVE_RETRY_BASE_SECONDS. After
+# ADAPTIVE_BREAKER_FAILURES failures in a row the RSN's circuit opens: it is skipped for ADAPTIVE_BREAKER_COOLDOWN_SECONDS, then probed once.
+ADAPTIVE_RETRY_BASE_SECONDS = 60
+ADAPTIVE_BREAKER_FAILURES = 5
+ADAPTIVE_BREAKER_COOLDOWN_SECONDS = 3600
+# /importplayers: largest accepted CSV (bytes / rows), and how many RSNs are validated against RunePixels at once
+IMPORT_MAX_BYTES = 256 * 1024
+IMPORT_MAX_ROWS = 1000
+IMPORT_VALIDATE_CONCURRENCY = MAX_CONCURRENT_PLAYERS
+# Validation stops after this many seconds (RSNs not checked by then are added unverified), so the report is sent
+# well within Discord's 15-minute interaction token
+IMPORT_VALIDATE_TIMEOUT_SECONDS = 600
+# Display names: resolved from the guild member cache first, then fetched (at most NAME_RESOLVE_CONCURRENCY at once) and cached
+NAME_CACHE_TTL_SECONDS = 3600
+NAME_RESOLVE_CONCURRENCY = 5
+# Minimum seconds between progressive leaderboard edits while /getdxp is still fetching (Discord edit rate limits)
+EMBED_EDIT_MIN_INTERVAL = 2.0
+# /getdxp results are paginated: players per leaderboard page (Skill Best pages hold MAX_EMBED_FIELDS skills),
+# and how long the prev/next buttons keep working
+LEADERBOARD_PAGE_SIZE = 20
+RESULTS_VIEW_TIMEOUT_SECONDS = 900
+# How the skills table is read once a page is loaded:
+#   "fast" - Selenium: one execute_script returning just the table cells; HTTP: streaming parser that only reads the table
+#   "soup" - BeautifulSoup over the whole page source (legacy behaviour)
+DXP_EXTRACTION_MODE = "fast"
+# Skill Best solver: "indexed" (default) or "v13" (original pass-by-pass scan). Both give identical results. The indexed
+# solver keeps v13's pass loop and only makes each pass cheaper, so the gain is modest: about 1.2-2.8x at 10-1000 players
+# (1.1-1.9x counting DXP parsing), a few tens of milliseconds at most. See benchmarks/bench_skill_best.py.
+SKILL_BEST_SOLVER = "indexed"
+# DXP fetch backends, tried in order until one returns data:
+#   "selenium" - full headless Chrome page load. The only backend that works against the live RunePixels site.
+#   "http"     - plain HTTP GET of the same page over a pooled requests.Session, no browser. For offline runs only:
+#                RunePixels renders the skills table client-side, so this only finds data on servers that serve it
+#                pre-rendered (benchmarks/fake_runepixels.py, recorded pages). Against the live site every request misses.
+FETCH_BACKENDS = ["selenium"]
+HTTP_FETCH_TIMEOUT = 10 # Seconds per HTTP request
+HTTP_FETCH_RETRIES = 2  # Connection-level retries for the HTTP backend
+# WebDriver pool: Chrome instances are kept alive and reused across players (pool size = MAX_CONCURRENT_PLAYERS).
+# A driver is recycled (quit and replaced) after serving this many pages...
+DRIVER_MAX_PAGES = 50
+# ...or once its Chrome processes use more than this many MB (JS heap if psutil is not installed). None disables.
+DRIVER_MAX_MEMORY_MB = 1024
+# How many times a scrape is retried on a fresh driver after a WebDriverException (e.g. Chrome crashed).
+DRIVER_CRASH_RETRIES = 1
+# Lean page mode for Selenium: driver.get returns at DOMContentLoaded (page_load_strategy "eager"; readiness polling
+# covers the rest) and images, fonts and trackers are never downloaded, since only the skills table is read.
+# Off until benchmarks/bench_page_mode.py has been run against real Chrome to confirm the table still renders and loads faster.
+CHROME_LEAN_MODE = False
+# URL patterns blocked in lean mode (Chrome DevTools Network.setBlockedURLs; "*" is a wildcard)
+CHROME_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", # Images
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",                             # Fonts (stylesheets load: layout may matter to rendering)
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",    # Analytics/ads
+    "*googlesyndication.com*", "*adservice.google.*", "*cloudflareinsights.com*", "*nitropay.com*",
+]
+# Stage timings and per-RSN scrape outcomes, shown by the owner-only /botstats. Percentiles cover the last STATS_WINDOW samples per stage.
+STATS_WINDOW = 500
+# Optional Prometheus text-format dump (e.g. for node_exporter's textfile collector), rewritten every
+# STATS_PROMETHEUS_INTERVAL_SECONDS. None disables it.
+STATS_PROMETHEUS_FILE = None
+STATS_PROMETHEUS_INTERVAL_SECONDS = 60
 # Name of a player (their Discord display name as fetched by the bot)
 # to use as a cutoff for "Skill Best" eligibility.
 # Only players appearing *before* this player in the fetched list (order can vary)
@@ -57,6 +187,7 @@ SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME = "Parzival" # Example, set to None or ""
 # Data files for persistence
 PLAYERS_FILE = "players_data.json" # Stores {discord_user_id_str: {"rsn": "RSN", ...}}
 ADMINS_FILE = "admins_data.json"   # Stores [admin_discord_user_id_str, ...]
+SNAPSHOTS_DB_FILE = "dxp_snapshots.db" # SQLite history of timestamped per-player, per-skill DXP snapshots
 # --- Configuration Ends ---
 
 # --- Helper Functions: Data Management (JSON) ---
@@ -78,33 +209,383 @@ def load_json_data(file_path, default_type_factory=dict):
         return default_type_factory()
 
 def save_json_data(data, file_path):
-    """Saves data to a JSON file."""
+    """Saves data to a JSON file atomically (temp file + rename), so a crash mid-write can't corrupt it."""
+    tmp_path = None
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(os.path.abspath(file_path)),
+                                         prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
             json.dump(data, f, indent=4)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
         return True
     except Exception as e:
         print(f"Error saving data to {file_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            with contextlib.suppress(OSError): os.remove(tmp_path)
         return False
 
+# --- Data Store: Player & Admin Registry ---
+class BotRegistry:
+    """
+    In-memory player/admin registry, loaded from PLAYERS_FILE/ADMINS_FILE on first use.
+    Permission checks and roster lookups never touch the disk. Changes are applied under a lock
+    (so concurrent commands can't lose updates) and persisted write-behind: all changes within
+    REGISTRY_FLUSH_DELAY seconds are coalesced into one atomic save per file.
+    """
+    def __init__(self, players_file: str, admins_file: str):
+        self.players_file, self.admins_file = players_file, admins_file
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock() # Serializes disk writes without holding up in-memory changes
+        self._loaded = False
+        self._players = {}     # discord_id_str -> {"rsn": "RSN", ...}
+        self._admins = set()   # admin discord user ids (int)
+        self._rsn_index = {}   # rsn_lower -> discord_id_str (the first owner, for files saved with duplicate RSNs)
+        self._dirty = set()    # files with unsaved changes
+        self._flush_timer = None
+
+    def _ensure_loaded(self):
+        if self._loaded: return
+        with self._lock:
+            if self._loaded: return
+            players = load_json_data(self.players_file, default_type_factory=dict)
+            self._players = {str(did): entry for did, entry in players.items() if isinstance(entry, dict)} if isinstance(players, dict) else {}
+            admins = load_json_data(self.admins_file, default_type_factory=list)
+            self._admins = {int(a) for a in admins if str(a).isdigit()} if isinstance(admins, list) else set()
+            self._rsn_index = {}
+            for did, e in self._players.items():
+                if e.get("rsn"): self._rsn_index.setdefault(e["rsn"].strip().lower(), did)
+            self._loaded = True
+            print(f"Info: Registry loaded {len(self._players)} players and {len(self._admins)} admins.")
+
+    # -- Admins --
+    def is_admin(self, user_id: int) -> bool:
+        self._ensure_loaded()
+        return user_id in self._admins
+
+    def add_admin(self, user_id: int) -> bool:
+        """Returns False if the user was already an admin."""
+        self._ensure_loaded()
+        with self._lock:
+            if user_id in self._admins: return False
+            self._admins.add(user_id); self._mark_dirty(self.admins_file)
+            return True
+
+    def remove_admin(self, user_id: int) -> bool:
+        """Returns False if the user wasn't an admin."""
+        self._ensure_loaded()
+        with self._lock:
+            if user_id not in self._admins: return False
+            self._admins.discard(user_id); self._mark_dirty(self.admins_file)
+            return True
+
+    # -- Players --
+    def get_player(self, discord_id_str: str):
+        """Returns a copy of the player's entry, or None."""
+        self._ensure_loaded()
+        entry = self._players.get(discord_id_str)
+        return dict(entry) if entry else None
+
+    def find_by_rsn(self, rsn: str):
+        """Returns the discord_id_str registered with an RSN (case-insensitive), or None."""
+        self._ensure_loaded()
+        return self._rsn_index.get(rsn.strip().lower())
+
+    def roster(self):
+        """Returns [(discord_id_str, rsn), ...] for every player with an RSN set."""
+        self._ensure_loaded()
+        with self._lock: return [(did, e["rsn"]) for did, e in self._players.items() if e.get("rsn")]
+
+    def set_players(self, entries: dict):
+        """Adds/updates many players ({discord_id_str: entry}) as one change."""
+        self._ensure_loaded()
+        with self._lock:
+            for did, entry in entries.items():
+                old = self._players.get(did)
+                if old and old.get("rsn"): self._unindex_rsn(old["rsn"], did)
+                self._players[did] = entry
+                if entry.get("rsn"): self._rsn_index.setdefault(entry["rsn"].strip().lower(), did) # Never moves an RSN off its owner
+            self._mark_dirty(self.players_file)
+
+    def claim_players(self, entries: dict) -> dict:
+        """
+        Like set_players, but skips entries whose RSN is registered to a different player, checked under the same
+        lock as the write. Returns {discord_id_str: owner_discord_id_str} for the skipped entries.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            conflicts = {did: self._rsn_index[e["rsn"].strip().lower()] for did, e in entries.items()
+                         if self._rsn_index.get(e["rsn"].strip().lower(), did) != did}
+            accepted = {did: e for did, e in entries.items() if did not in conflicts}
+            if accepted: self.set_players(accepted)
+            return conflicts
+
+    def set_player(self, discord_id_str: str, entry: dict):
+        self.set_players({discord_id_str: entry})
+
+    def remove_player(self, discord_id_str: str):
+        """Removes and returns the player's entry, or None if they weren't registered."""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._players.pop(discord_id_str, None)
+            if entry is None: return None
+            if entry.get("rsn"): self._unindex_rsn(entry["rsn"], discord_id_str)
+            self._mark_dirty(self.players_file)
+            return entry
+
+    def _unindex_rsn(self, rsn: str, discord_id_str: str):
+        """Drops discord_id_str's claim on an RSN, handing it to any other player still registered with it."""
+        key = rsn.strip().lower()
+        if self._rsn_index.get(key) != discord_id_str: return
+        other = next((did for did, e in self._players.items() if did != discord_id_str and (e.get("rsn") or "").strip().lower() == key), None)
+        if other: self._rsn_index[key] = other
+        else: del self._rsn_index[key]
+
+    # -- Persistence --
+    def _mark_dirty(self, file_path: str):
+        with self._lock:
+            self._dirty.add(file_path)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(REGISTRY_FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Atomically saves every file with pending changes."""
+        with self._write_lock:
+            with self._lock: # Snapshot under the lock so each save sees a consistent state
+                if self._flush_timer is not None: self._flush_timer.cancel()
+                self._flush_timer = None
+                dirty, self._dirty = self._dirty, set()
+                snapshots = {self.players_file: dict(self._players), self.admins_file: sorted(self._admins)}
+            for file_path in dirty:
+                if not save_json_data(snapshots[file_path], file_path): self._mark_dirty(file_path) # Retry later
+
+REGISTRY = BotRegistry(PLAYERS_FILE, ADMINS_FILE)
+atexit.register(REGISTRY.flush)
+
 # --- Helper: DXP Value Formatting ---
-def _format_dxp_for_display(dxp_raw_val, for_embed_value=False):
-    """Helper to format DXP values for display in Discord messages."""
+def _parse_dxp_int(dxp_raw_val):
+    """Parses a raw DXP string like '1,234 567' into an int. Returns None for placeholders/non-numeric values."""
     val_str = str(dxp_raw_val).strip()
-    if val_str == NO_DATA_PLACEHOLDER: return f"`{NO_DATA_PLACEHOLDER}`"
-    try:
-        num_val = int(val_str.replace(' ','').replace(',',''))
-        formatted_num = f"`{num_val:,}`"
-        return f"**{formatted_num}**" if for_embed_value else formatted_num
-    except ValueError: return f"`{val_str[:100]}`" # Truncate if very long non-numeric
+    if val_str == NO_DATA_PLACEHOLDER: return None
+    try: return int(val_str.replace(' ','').replace(',',''))
+    except ValueError: return None
 
-# --- Core Logic: DXP Scraping ---
-def get_player_dxp_data(rsn: str):
-    """Fetches DXP data for an RSN from RunePixels. Manages its own WebDriver."""
-    thread_name = threading.current_thread().name 
-    player_url = f"https://runepixels.com/players/{urllib.parse.quote(rsn)}/skills"
-    print(f"Thread-{thread_name}: Fetching DXP for RSN: {rsn} from {player_url}")
+def _format_dxp_for_display(dxp_value, for_embed_value=False):
+    """Helper to format a parsed DXP value (None = no data) for display in Discord messages."""
+    if dxp_value is None: return f"`{NO_DATA_PLACEHOLDER}`"
+    formatted_num = f"`{dxp_value:,}`"
+    return f"**{formatted_num}**" if for_embed_value else formatted_num
+
+# --- Core Logic: Compact DXP Records ---
+class SkillTable:
+    """Append-only skill name <-> id table shared by every DxpRecord. Names are matched case-insensitively."""
+    def __init__(self, names):
+        self.names, self.keys, self._ids = [], [], {} # id -> display name, id -> lower-cased name, lower-cased name -> id
+        self._lock = threading.Lock()
+        for name in names: self.id_for(name)
+
+    def id_for(self, name: str) -> int:
+        key = name.strip().lower()
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    self.names.append(name.strip()); self.keys.append(key)
+                    skill_id = self._ids[key] = len(self.keys) - 1
+        return skill_id
+
+SKILL_TABLE = SkillTable(SKILL_NAMES)
+OVERALL_SKILL_ID = SKILL_TABLE.id_for("Overall")
+
+class DxpRecord:
+    """
+    One player's DXP, parsed once when scraped and shared by the cache, leaderboard, Skill Best and renderers.
+    values[id] is the DXP for a SKILL_TABLE id; bit id of `missing` is set when that skill has no numeric DXP
+    (not on the page, or shown as NO_DATA_PLACEHOLDER). `order` lists the skills the page showed, in page order.
+    Pickles as (name, value) pairs, so worker processes with differently numbered tables can exchange records.
+    """
+    __slots__ = ("order", "values", "missing")
+
+    def __init__(self, id_values):
+        """id_values: [(skill_id, int or None), ...] in page order; a repeated id keeps its first position and last value."""
+        by_id = {}
+        for skill_id, value in id_values: by_id[skill_id] = value
+        self.order = tuple(by_id)
+        size = max(self.order) + 1 if self.order else 0
+        self.values, self.missing = array('q', [0]) * size, (1 << size) - 1
+        for skill_id, value in by_id.items():
+            if value is not None: self.values[skill_id] = value; self.missing &= ~(1 << skill_id)
+
+    @classmethod
+    def from_raw(cls, raw: dict):
+        """Parses a fetch backend's {skill: dxp_str}."""
+        return cls([(SKILL_TABLE.id_for(skill), _parse_dxp_int(dxp_raw)) for skill, dxp_raw in raw.items()])
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Builds a record from [(skill_name, int or None), ...]."""
+        return cls([(SKILL_TABLE.id_for(skill), value) for skill, value in pairs])
+
+    def get(self, skill_id: int):
+        """DXP for a skill id, or None if it has none."""
+        if skill_id >= len(self.values) or self.missing >> skill_id & 1: return None
+        return self.values[skill_id]
+
+    def items(self):
+        """Yields (skill_id, int or None) for each skill the page showed, in page order."""
+        for skill_id in self.order: yield skill_id, self.get(skill_id)
+
+    def total(self) -> int:
+        """Sum of every skill's DXP, excluding RunePixels' own "Overall" row."""
+        return sum(value for skill_id, value in self.items() if value is not None and skill_id != OVERALL_SKILL_ID)
+
+    def to_raw(self) -> dict:
+        """{skill_name: dxp_str} in the shape fetch backends return, for code that still works on raw strings."""
+        return {SKILL_TABLE.names[skill_id]: f"{value:,}" if value is not None else NO_DATA_PLACEHOLDER for skill_id, value in self.items()}
+
+    def __len__(self):
+        return len(self.order)
+
+    def __eq__(self, other):
+        if not isinstance(other, DxpRecord): return NotImplemented
+        return self.order == other.order and self.missing == other.missing and self.values == other.values
 
+    def __reduce__(self):
+        return (DxpRecord.from_pairs, ([(SKILL_TABLE.names[skill_id], value) for skill_id, value in self.items()],))
+
+    def __repr__(self):
+        return f"DxpRecord({self.to_raw()!r})"
+
+# --- Instrumentation: Stage Timings & Scrape Outcomes ---
+class BotStats:
+    """
+    Thread-safe rolling timings per stage (driver start, page load, readiness wait, parsing, name lookups,
+    Skill Best, ...) plus per-RSN scrape outcome counters ("success", "timeout", "error"; one per scrape) and
+    per-backend fetch attempt counters (one per backend tried).
+    Percentiles cover the last `window` samples of a stage; histogram buckets, sums and outcome counters are
+    cumulative since start. Scrape worker processes record into their own BotStats and send it back with
+    each result (export() there, merge() here).
+    """
+    BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60) # Seconds, Prometheus histogram "le" bounds
+
+    def __init__(self, window: int):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window)) # stage -> recent durations
+        self._buckets = defaultdict(lambda: [0] * (len(self.BUCKETS) + 1)) # stage -> counts per bucket, last is +Inf
+        self._sums = defaultdict(float)
+        self._outcomes = defaultdict(lambda: defaultdict(int)) # rsn_key -> {outcome: count}
+        self._attempts = defaultdict(lambda: defaultdict(int)) # backend -> {fetch outcome: count}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples[stage].append(seconds)
+            self._buckets[stage][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            self._sums[stage] += seconds
+
+    @contextlib.contextmanager
+    def timed(self, stage: str):
+        """Context manager recording how long its block took under `stage` (also when it raises)."""
+        start = time.perf_counter()
+        try: yield
+        finally: self.record(stage, time.perf_counter() - start)
+
+    def count(self, rsn: str, outcome: str):
+        with self._lock: self._outcomes[rsn.strip().lower()][outcome] += 1
+
+    def count_attempt(self, backend: str, outcome: str):
+        with self._lock: self._attempts[backend][outcome] += 1
+
+    def attempt_totals(self) -> dict:
+        """Returns {backend: {fetch outcome: count}}."""
+        with self._lock: return {backend: dict(o) for backend, o in self._attempts.items()}
+
+    def stage_summary(self, stage: str):
+        """Returns {'count', 'p50', 'p95', 'max'} (seconds) over the stage's recent samples, or None if empty."""
+        with self._lock: samples = sorted(self._samples.get(stage, ()))
+        if not samples: return None
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+        return {'count': len(samples), 'p50': pick(0.50), 'p95': pick(0.95), 'max': samples[-1]}
+
+    def summary(self) -> dict:
+        with self._lock: stages = sorted(self._samples)
+        return {stage: self.stage_summary(stage) for stage in stages}
+
+    def outcome_totals(self) -> dict:
+        totals = defaultdict(int)
+        with self._lock:
+            for outcomes in self._outcomes.values():
+                for outcome, n in outcomes.items(): totals[outcome] += n
+        return dict(totals)
+
+    def worst_rsns(self, limit: int = 10):
+        """Returns [(rsn_key, {outcome: count})] for the RSNs with the most timeouts + errors."""
+        with self._lock: items = [(rsn, dict(o)) for rsn, o in self._outcomes.items() if o.get('timeout') or o.get('error')]
+        items.sort(key=lambda item: item[1].get('timeout', 0) + item[1].get('error', 0), reverse=True)
+        return items[:limit]
+
+    def export(self) -> dict:
+        """Plain-data copy of everything recorded, for sending from a worker process."""
+        with self._lock:
+            return {'samples': {stage: list(samples) for stage, samples in self._samples.items()},
+                    'outcomes': {rsn: dict(o) for rsn, o in self._outcomes.items()},
+                    'attempts': {backend: dict(o) for backend, o in self._attempts.items()}}
+
+    def merge(self, exported: dict):
+        for stage, samples in exported.get('samples', {}).items():
+            for seconds in samples: self.record(stage, seconds)
+        with self._lock:
+            for rsn, outcomes in exported.get('outcomes', {}).items():
+                for outcome, n in outcomes.items(): self._outcomes[rsn][outcome] += n
+            for backend, outcomes in exported.get('attempts', {}).items():
+                for outcome, n in outcomes.items(): self._attempts[backend][outcome] += n
+
+    def to_prometheus(self) -> str:
+        """Renders the cumulative histograms and counters in Prometheus text exposition format."""
+        esc = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        lines = ["# HELP dxp_bot_stage_seconds Time spent in each bot stage.", "# TYPE dxp_bot_stage_seconds histogram"]
+        with self._lock:
+            for stage in sorted(self._buckets):
+                cumulative = 0
+                for bound, n in zip(self.BUCKETS + ("+Inf",), self._buckets[stage]):
+                    cumulative += n
+                    lines.append(f'dxp_bot_stage_seconds_bucket{{stage="{esc(stage)}",le="{bound}"}} {cumulative}')
+                lines.append(f'dxp_bot_stage_seconds_sum{{stage="{esc(stage)}"}} {self._sums[stage]:.6f}')
+                lines.append(f'dxp_bot_stage_seconds_count{{stage="{esc(stage)}"}} {cumulative}')
+            lines += ["# HELP dxp_bot_scrape_outcomes_total Scrape outcomes per RSN.", "# TYPE dxp_bot_scrape_outcomes_total counter"]
+            for rsn in sorted(self._outcomes):
+                for outcome, n in sorted(self._outcomes[rsn].items()):
+                    lines.append(f'dxp_bot_scrape_outcomes_total{{rsn="{esc(rsn)}",outcome="{esc(outcome)}"}} {n}')
+            lines += ["# HELP dxp_bot_fetch_attempts_total Fetch attempts per backend and outcome.", "# TYPE dxp_bot_fetch_attempts_total counter"]
+            for backend in sorted(self._attempts):
+                for outcome, n in sorted(self._attempts[backend].items()):
+                    lines.append(f'dxp_bot_fetch_attempts_total{{backend="{esc(backend)}",outcome="{esc(outcome)}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+STATS = BotStats(STATS_WINDOW)
+
+def write_prometheus_file(file_path: str) -> bool:
+    """Atomically writes STATS in Prometheus text format, so a scraper never reads a half-written file."""
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(os.path.abspath(file_path)),
+                                         prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            f.write(STATS.to_prometheus())
+        os.replace(tmp_path, file_path)
+        return True
+    except Exception as e:
+        print(f"Error writing stats to {file_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            with contextlib.suppress(OSError): os.remove(tmp_path)
+        return False
+
+# --- Core Logic: WebDriver Pool ---
+def _build_chrome_options():
+    """Builds the headless ChromeOptions used for every pooled driver."""
     options = webdriver.ChromeOptions()
     options.add_argument('--headless=new')
     options.add_argument('--disable-gpu')
@@ -113,30 +594,169 @@ def get_player_dxp_data(rsn: str):
     options.add_argument(f"user-agent={HEADERS['User-Agent']}")
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
     options.add_argument("--log-level=3")
+    if CHROME_LEAN_MODE:
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return options
 
-    driver = None
+def _create_chrome_driver():
+    """Starts a new headless Chrome WebDriver (with CHROME_BLOCKED_URL_PATTERNS blocked in lean mode)."""
+    options = _build_chrome_options()
+    if WEBDRIVER_PATH and os.path.isfile(WEBDRIVER_PATH):
+        driver = webdriver.Chrome(service=ChromeService(executable_path=WEBDRIVER_PATH), options=options)
+    else: driver = webdriver.Chrome(options=options) # Assumes chromedriver is in PATH
+    if CHROME_LEAN_MODE:
+        try: # Applies to every page this driver loads
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': CHROME_BLOCKED_URL_PATTERNS})
+        except WebDriverException as e: print(f"Warning: Could not set blocked URLs on new Chrome driver: {e}")
+    return driver
+
+def _driver_memory_mb(driver):
+    """Best-effort memory usage (MB) of a driver's Chrome processes. Returns None if unknown."""
     try:
-        if WEBDRIVER_PATH and os.path.isfile(WEBDRIVER_PATH):
-            service = ChromeService(executable_path=WEBDRIVER_PATH)
-            driver = webdriver.Chrome(service=service, options=options)
-        else:
-            driver = webdriver.Chrome(options=options) # Assumes chromedriver is in PATH
-        driver.get(player_url)
-        WebDriverWait(driver, 45).until(EC.visibility_of_element_located((By.TAG_NAME, "app-table")))
-        time.sleep(PAGE_LOAD_DELAY) # Crucial pause for dynamic content
-        page_source = driver.page_source
-    except TimeoutException:
-        print(f"Thread-{thread_name}: Error - Timeout for RSN: {rsn}.")
-        return None
-    except WebDriverException as wd_e:
-        print(f"Thread-{thread_name}: Error - WebDriverException for RSN: {rsn} - {wd_e}")
-        return None
-    except Exception as e:
-        print(f"Thread-{thread_name}: Error - Unexpected Selenium error for RSN: {rsn} - {e}")
+        if psutil:
+            root = psutil.Process(driver.service.process.pid) # chromedriver; Chrome runs as its children
+            return sum(p.memory_info().rss for p in root.children(recursive=True)) / (1024 * 1024)
+        heap = driver.execute_script("return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null")
+        return heap / (1024 * 1024) if heap else None
+    except Exception:
         return None
-    finally:
-        if driver: driver.quit()
 
+class PooledDriver:
+    """A pooled WebDriver plus the bookkeeping used to decide when to recycle it."""
+    __slots__ = ("driver", "pages_served", "broken")
+
+    def __init__(self, driver):
+        self.driver, self.pages_served, self.broken = driver, 0, False
+
+class ChromeDriverPool:
+    """
+    Thread-safe pool of long-lived headless Chrome drivers.
+    At most `size` drivers exist at once. Drivers are started lazily, health-checked on checkout,
+    and recycled after DRIVER_MAX_PAGES pages or DRIVER_MAX_MEMORY_MB. A driver that raised a
+    WebDriverException is marked broken and replaced on the next checkout, so a crash never costs a slot.
+    """
+    def __init__(self, size: int, driver_factory=_create_chrome_driver):
+        self._factory = driver_factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue() # LIFO keeps the warmest drivers busy
+        self._closed = False
+
+    def _spawn(self):
+        print(f"Thread-{threading.current_thread().name}: Starting new pooled Chrome driver.")
+        with STATS.timed("driver_start"): return PooledDriver(self._factory())
+
+    def _discard(self, pooled: PooledDriver):
+        try: pooled.driver.quit()
+        except Exception as e: print(f"Warning: Error quitting pooled driver: {e}")
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try: return pooled.driver.execute_script("return 1") == 1
+        except Exception: return False
+
+    def _needs_recycle(self, pooled: PooledDriver) -> bool:
+        if DRIVER_MAX_PAGES and pooled.pages_served >= DRIVER_MAX_PAGES: return True
+        if DRIVER_MAX_MEMORY_MB:
+            mem_mb = _driver_memory_mb(pooled.driver)
+            if mem_mb is not None and mem_mb > DRIVER_MAX_MEMORY_MB:
+                print(f"Info: Recycling pooled driver using {mem_mb:.0f} MB (limit {DRIVER_MAX_MEMORY_MB} MB).")
+                return True
+        return False
+
+    def checkout(self) -> PooledDriver:
+        """Blocks until a slot is free, then returns a healthy (possibly freshly started) driver."""
+        if self._closed: raise RuntimeError("ChromeDriverPool is closed.")
+        self._slots.acquire()
+        try:
+            while True:
+                try: pooled = self._idle.get_nowait()
+                except queue.Empty: return self._spawn()
+                if self._is_healthy(pooled): return pooled
+                print("Warning: Pooled driver failed health check, replacing it.")
+                self._discard(pooled)
+        except BaseException:
+            self._slots.release(); raise
+
+    def checkin(self, pooled: PooledDriver):
+        """Returns a driver to the pool, quitting it instead if it is broken or due for recycling."""
+        try:
+            if pooled.broken or self._closed or self._needs_recycle(pooled): self._discard(pooled)
+            else: self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextlib.contextmanager
+    def driver(self):
+        """Context manager: checks out a driver and checks it back in, marking it broken on WebDriverException."""
+        pooled = self.checkout()
+        try:
+            yield pooled.driver
+        except TimeoutException:
+            raise # Slow page, not a dead browser
+        except WebDriverException:
+            pooled.broken = True; raise
+        finally:
+            pooled.pages_served += 1
+            self.checkin(pooled)
+
+    def close(self):
+        """Quits all idle drivers; drivers still checked out are quit when returned."""
+        self._closed = True
+        while True:
+            try: self._discard(self._idle.get_nowait())
+            except queue.Empty: break
+
+DRIVER_POOL = ChromeDriverPool(MAX_CONCURRENT_PLAYERS)
+
+# --- Core Logic: Page Readiness ---
+# Reads the DXP column (td index 6) of every data row in the skills table
+_DXP_COLUMN_SCRIPT = """
+return Array.from(document.querySelectorAll('app-table table tr'))
+    .map(r => r.querySelectorAll('td'))
+    .filter(cols => cols.length > 6)
+    .map(cols => cols[6].textContent.trim());
+"""
+def wait_for_dxp_ready(driver):
+    """
+    Waits until the DXP column is ready according to READINESS_MODE.
+    Returns (seconds_waited, reason) and records the wait as the "page_ready" stage in STATS.
+    """
+    start = time.monotonic()
+    if READINESS_MODE == "fixed":
+        time.sleep(PAGE_LOAD_DELAY)
+        reason = "fixed"
+    else:
+        reason, last_values, stable_polls = "timeout", None, 0
+        while time.monotonic() - start < READINESS_TIMEOUT:
+            values = driver.execute_script(_DXP_COLUMN_SCRIPT) or []
+            if values and all(v and v != NO_DATA_PLACEHOLDER for v in values):
+                reason = "filled"; break
+            stable_polls = stable_polls + 1 if values and values == last_values else 0
+            if stable_polls >= READINESS_STABLE_POLLS:
+                if any(_parse_dxp_int(v) is not None for v in values):
+                    reason = "stable"; break
+                if time.monotonic() - start >= PAGE_LOAD_DELAY: # All "--": long enough that it isn't a skeleton
+                    reason = "stable_empty"; break
+            last_values = values
+            time.sleep(READINESS_POLL_INTERVAL)
+    waited = time.monotonic() - start
+    STATS.record("page_ready", waited)
+    return waited, reason
+
+def summarize_readiness_timings():
+    """Returns {'count', 'p50', 'p95', 'max'} (seconds) over recent page readiness waits, or None if empty."""
+    return STATS.stage_summary("page_ready")
+
+# --- Core Logic: DXP Parsing ---
+def parse_dxp_table_html(page_source: str, rsn: str):
+    """Parses the RunePixels skills page HTML into {skill: dxp} using DXP_EXTRACTION_MODE. Returns None if the table is missing."""
+    return parse_dxp_table_stream(page_source, rsn) if DXP_EXTRACTION_MODE == "fast" else parse_dxp_table_soup(page_source, rsn)
+
+def parse_dxp_table_soup(page_source: str, rsn: str):
+    """Legacy parser: BeautifulSoup over the whole page."""
+    thread_name = threading.current_thread().name 
     soup = BeautifulSoup(page_source, 'html.parser')
     app_table = soup.find('app-table')
     if not app_table: 
@@ -165,9 +785,766 @@ def get_player_dxp_data(rsn: str):
         return None
     return dxp_data
 
+class _SkillsTableExtractor(HTMLParser):
+    """
+    Streaming extractor for the first <table> inside the first <app-table>. Ignores everything
+    outside it and stops feeding once the table closes, so no tree is built for the rest of the page.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found_app_table = self.found_table = self.done = False
+        self.rows = [] # [[cell_text, ...], ...] for rows containing <td>s
+        self._table_depth, self._row, self._cell = 0, None, None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done: return
+        if not self.found_app_table:
+            self.found_app_table = tag == 'app-table'; return
+        if tag == 'table':
+            self.found_table = True; self._table_depth += 1
+        elif self._table_depth and tag == 'tr':
+            self._end_row(); self._row = []
+        elif self._table_depth and tag == 'td' and self._row is not None:
+            self._end_cell(); self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or not self._table_depth: return
+        if tag == 'td': self._end_cell()
+        elif tag == 'tr': self._end_row()
+        elif tag == 'table':
+            self._table_depth -= 1
+            if not self._table_depth: self._end_row(); self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None: self._cell.append(data)
+
+    def _end_cell(self):
+        if self._cell is not None: self._row.append("".join(self._cell).strip())
+        self._cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row: self.rows.append(self._row)
+        self._row = None
+
+def parse_dxp_table_stream(page_source: str, rsn: str, chunk_size: int = 16384):
+    """Fast parser: jumps to the first <app-table> and streams from there through _SkillsTableExtractor."""
+    thread_name = threading.current_thread().name 
+    extractor = _SkillsTableExtractor()
+    start = page_source.find('<app-table')
+    if start < 0: start = len(page_source) # Let the extractor report the missing table
+    try:
+        for i in range(start, len(page_source), chunk_size):
+            extractor.feed(page_source[i:i + chunk_size])
+            if extractor.done: break
+    except Exception as e:
+        print(f"Thread-{thread_name}: Error - Parsing table for RSN {rsn}: {e}")
+        return None
+    if not extractor.found_app_table:
+        print(f"Thread-{thread_name}: Error - No <app-table> found for {rsn}.")
+        return None
+    if not extractor.found_table:
+        print(f"Thread-{thread_name}: Error - No <table> within <app-table> for {rsn}.")
+        return None
+    return _dxp_rows_to_dict(extractor.rows)
+
+def _dxp_rows_to_dict(rows):
+    """Builds {skill: dxp} from table rows of cell texts (skill name in col 0, DXP in col 6)."""
+    return {cols[0]: cols[6] for cols in rows if len(cols) > 6 and cols[0]}
+
+# Returns [[skill, dxp], ...] straight from the live DOM, or null if the table isn't there
+_SKILLS_TABLE_SCRIPT = """
+const table = document.querySelector('app-table table');
+if (!table) return null;
+return Array.from(table.querySelectorAll('tr'))
+    .map(r => Array.from(r.querySelectorAll('td')))
+    .filter(cols => cols.length > 6)
+    .map(cols => [cols[0].textContent.trim(), cols[6].textContent.trim()]);
+"""
+
+def player_skills_url(rsn: str) -> str:
+    return f"{RUNEPIXELS_BASE_URL}/players/{urllib.parse.quote(rsn)}/skills"
+
+# --- Core Logic: DXP Fetch Backends ---
+# Every backend exposes `name` and `fetch(rsn)`, returning ({skill: dxp} or None, outcome) where outcome is
+# "success", "no_data" (page loaded but held no usable table), "not_found" (the player doesn't exist), "timeout" or "error".
+class HttpDxpFetcher:
+    """
+    Browser-free backend: GETs the skills page over a pooled keep-alive requests.Session
+    (bounded connections, gzip) and parses it directly. Only succeeds when the response
+    already contains the filled-in skills table; otherwise the next backend is tried.
+    This is the case for offline stand-ins (benchmarks/fake_runepixels.py), not for the live
+    site, which renders the table client-side; on_ready warns if it's configured against it.
+    """
+    name = "http"
+
+    def __init__(self, max_connections: int = MAX_CONCURRENT_PLAYERS):
+        self._session = requests.Session()
+        self._session.headers.update(HEADERS)
+        self._session.headers['Accept-Encoding'] = 'gzip, deflate'
+        # Only connection failures are retried (those requests never reached RunePixels, so they don't need their own rate-limit token)
+        retries = Retry(total=HTTP_FETCH_RETRIES, read=0, status=0, redirect=0)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True, max_retries=retries)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def fetch(self, rsn: str):
+        thread_name = threading.current_thread().name 
+        try:
+            acquire_runepixels_token()
+            with STATS.timed("http_get"):
+                response = self._session.get(player_skills_url(rsn), timeout=HTTP_FETCH_TIMEOUT)
+                if response.status_code == 404: return None, "not_found"
+                response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Thread-{thread_name}: Error - HTTP fetch failed for RSN: {rsn} - {e}")
+            return None, "timeout" if isinstance(e, requests.Timeout) else "error"
+        with STATS.timed("parse"): dxp_data = parse_dxp_table_html(response.text, rsn)
+        if not dxp_data or not any(v and v != NO_DATA_PLACEHOLDER for v in dxp_data.values()):
+            return None, "no_data" # Table absent or not yet populated (client-side rendering)
+        return dxp_data, "success"
+
+    def close(self):
+        self._session.close()
+
+class SeleniumDxpFetcher:
+    """Full-browser backend: loads the skills page in a driver from DRIVER_POOL."""
+    name = "selenium"
+
+    def fetch(self, rsn: str):
+        thread_name = threading.current_thread().name 
+        page_source = table_rows = None
+        for attempt in range(DRIVER_CRASH_RETRIES + 1):
+            try:
+                with DRIVER_POOL.driver() as driver:
+                    acquire_runepixels_token()
+                    with STATS.timed("page_load"):
+                        driver.get(player_skills_url(rsn))
+                        WebDriverWait(driver, 45).until(EC.visibility_of_element_located((By.TAG_NAME, "app-table")))
+                    waited, reason = wait_for_dxp_ready(driver) # Crucial wait for dynamic content
+                    print(f"Thread-{thread_name}: Page for {rsn} ready after {waited:.2f}s ({reason}).")
+                    with STATS.timed("parse"):
+                        if DXP_EXTRACTION_MODE == "fast": table_rows = driver.execute_script(_SKILLS_TABLE_SCRIPT)
+                        else: page_source = driver.page_source
+                break
+            except TimeoutException:
+                print(f"Thread-{thread_name}: Error - Timeout for RSN: {rsn}.")
+                return None, "timeout"
+            except WebDriverException as wd_e:
+                print(f"Thread-{thread_name}: Error - WebDriverException for RSN: {rsn} (attempt {attempt + 1}) - {wd_e}")
+                if attempt >= DRIVER_CRASH_RETRIES: return None, "error"
+            except Exception as e:
+                print(f"Thread-{thread_name}: Error - Unexpected Selenium error for RSN: {rsn} - {e}")
+                return None, "error"
+        if DXP_EXTRACTION_MODE != "fast":
+            with STATS.timed("parse"): dxp_data = parse_dxp_table_soup(page_source, rsn)
+            return dxp_data, "success" if dxp_data is not None else "no_data"
+        if table_rows is None:
+            print(f"Thread-{thread_name}: Error - No <table> within <app-table> for {rsn}.")
+            return None, "no_data"
+        return {skill: dxp for skill, dxp in table_rows if skill}, "success"
+
+    def close(self):
+        DRIVER_POOL.close()
+
+_FETCHER_FACTORIES = {HttpDxpFetcher.name: HttpDxpFetcher, SeleniumDxpFetcher.name: SeleniumDxpFetcher}
+FETCHERS = [_FETCHER_FACTORIES[name]() for name in FETCH_BACKENDS]
+atexit.register(lambda: [f.close() for f in FETCHERS])
+
+# --- Core Logic: DXP Scraping ---
+def fetch_player_dxp(rsn: str):
+    """
+    Fetches DXP data for an RSN, trying each backend in FETCH_BACKENDS until one succeeds.
+    A "not_found" answer is final (other backends would load the same missing page, only slower).
+    Returns (DxpRecord or None, outcome of the last backend tried). Counts exactly one scrape outcome in STATS:
+    "success", "timeout" (the last backend timed out) or "error" (anything else, including no backend returning data).
+    """
+    thread_name = threading.current_thread().name 
+    print(f"Thread-{thread_name}: Fetching DXP for RSN: {rsn} from {player_skills_url(rsn)}")
+    record, outcome = None, "error"
+    with STATS.timed("scrape"):
+        try:
+            for fetcher in FETCHERS:
+                dxp_data, outcome = fetcher.fetch(rsn)
+                STATS.count_attempt(fetcher.name, outcome)
+                if dxp_data is not None:
+                    record = DxpRecord.from_raw(dxp_data); break
+                if outcome == "not_found":
+                    print(f"Thread-{thread_name}: Info - RSN {rsn} not found on RunePixels."); break
+                print(f"Thread-{thread_name}: Info - '{fetcher.name}' backend returned no data for {rsn} ({outcome}).")
+        except Exception as e:
+            print(f"Thread-{thread_name}: Error - Unexpected error fetching RSN: {rsn} - {e}")
+            record, outcome = None, "error"
+    STATS.count(rsn, outcome if outcome in ("success", "timeout") else "error")
+    return record, outcome
+
+def get_player_dxp_data(rsn: str):
+    """Fetches DXP data for an RSN (see fetch_player_dxp). Returns a DxpRecord or None."""
+    return fetch_player_dxp(rsn)[0]
+
+# --- Core Logic: Scrape Dispatch ---
+class TokenBucket:
+    """
+    Blocking token bucket: allows `burst` immediate acquisitions, refilled at `rate` per second (a falsy rate disables it).
+    Its state lives in shared memory behind a multiprocessing lock, so scrape threads and the worker processes it is
+    handed to at startup all draw from the same bucket.
+    """
+    def __init__(self, rate: float, burst: int, mp_context=None):
+        ctx = mp_context or multiprocessing.get_context("spawn")
+        self.rate, self.burst = rate, burst
+        self._lock = ctx.Lock()
+        self._state = ctx.RawArray('d', [float(burst), time.monotonic()]) # [tokens, last refill]; monotonic is system-wide
+
+    def acquire(self) -> float:
+        """Blocks until a token is available. Returns the seconds spent waiting."""
+        if not self.rate: return 0.0
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens = min(self.burst, self._state[0] + (now - self._state[1]) * self.rate)
+                self._state[1] = now
+                if tokens >= 1:
+                    self._state[0] = tokens - 1
+                    return now - start
+                self._state[0] = tokens
+            time.sleep((1 - tokens) / self.rate)
+
+_SCRAPE_LOCAL = threading.local() # Per scrape thread: seconds spent waiting on the rate limiter during the current job
+
+def acquire_runepixels_token():
+    """Takes a RUNEPIXELS_RATE_LIMITER token; called right before every request to RunePixels."""
+    waited = RUNEPIXELS_RATE_LIMITER.acquire()
+    if waited: STATS.record("rate_limit_wait", waited)
+    _SCRAPE_LOCAL.rate_wait = getattr(_SCRAPE_LOCAL, 'rate_wait', 0.0) + waited
+
+# Settings a scrape worker process needs; copied from the bot process so runtime changes reach the workers
+_WORKER_CONFIG_NAMES = ("RUNEPIXELS_BASE_URL", "FETCH_BACKENDS", "DXP_EXTRACTION_MODE", "READINESS_MODE", "PAGE_LOAD_DELAY",
+                        "READINESS_TIMEOUT", "READINESS_POLL_INTERVAL", "READINESS_STABLE_POLLS", "HTTP_FETCH_TIMEOUT", "WEBDRIVER_PATH",
+                        "STATS_WINDOW", "CHROME_LEAN_MODE", "CHROME_BLOCKED_URL_PATTERNS")
+
+def _scrape_process_init(config: dict, rate_limiter: TokenBucket):
+    """Runs once in each scrape worker process: applies the bot's settings, joins the shared rate limiter and rebuilds the fetch backends."""
+    global FETCHERS, RUNEPIXELS_RATE_LIMITER
+    globals().update(config)
+    RUNEPIXELS_RATE_LIMITER = rate_limiter
+    FETCHERS = [_FETCHER_FACTORIES[name]() for name in FETCH_BACKENDS]
+    print(f"Info: Scrape worker process {os.getpid()} started.")
+
+def _scrape_job(rsn: str):
+    """Scrape job: returns (dxp_data, outcome, seconds the fetch took excluding rate-limit waits)."""
+    _SCRAPE_LOCAL.rate_wait = 0.0
+    start = time.perf_counter()
+    dxp_data, outcome = fetch_player_dxp(rsn)
+    return dxp_data, outcome, time.perf_counter() - start - _SCRAPE_LOCAL.rate_wait
+
+def _scrape_job_with_stats(rsn: str):
+    """Process-mode scrape job: _scrape_job's result plus the stats recorded during this job, for the bot process to merge."""
+    global STATS
+    STATS = BotStats(STATS_WINDOW) # Fresh per job, so each export holds just this scrape
+    return (*_scrape_job(rsn), STATS.export())
+
+def _create_scrape_executor():
+    if SCRAPE_WORKER_MODE == "process":
+        # "spawn" so workers don't inherit the bot's event loop, sockets and threads via fork
+        return concurrent.futures.ProcessPoolExecutor(max_workers=SCRAPE_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+                                                      initializer=_scrape_process_init, initargs=({name: globals()[name] for name in _WORKER_CONFIG_NAMES}, RUNEPIXELS_RATE_LIMITER))
+    return concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PLAYERS, thread_name_prefix="dxp-scrape")
+
+# Shared by every scrape (commands, sweeps, background refreshes, imports) so concurrent callers can't oversubscribe Chrome
+RUNEPIXELS_RATE_LIMITER = TokenBucket(RUNEPIXELS_RATE_LIMIT_PER_SECOND, RUNEPIXELS_RATE_LIMIT_BURST)
+SCRAPE_EXECUTOR = _create_scrape_executor()
+SCRAPE_CONCURRENCY = SCRAPE_PROCESS_WORKERS if SCRAPE_WORKER_MODE == "process" else MAX_CONCURRENT_PLAYERS
+_scrape_slots = None # (event loop, asyncio.Semaphore of SCRAPE_CONCURRENCY), created on first use inside the running loop
+
+def _scrape_slot() -> asyncio.Semaphore:
+    global _scrape_slots
+    loop = asyncio.get_running_loop()
+    if _scrape_slots is None or _scrape_slots[0] is not loop: _scrape_slots = (loop, asyncio.Semaphore(SCRAPE_CONCURRENCY))
+    return _scrape_slots[1]
+
+async def scrape_player(rsn: str, report: dict = None):
+    """
+    Runs one RSN as a scrape job (at most SCRAPE_CONCURRENCY at once across all callers); returns a DxpRecord or None.
+    If given, `report` receives the fetch 'outcome' and the 'seconds' the fetch itself took (no queueing or rate-limit waits).
+    """
+    loop = asyncio.get_running_loop()
+    async with _scrape_slot():
+        if SCRAPE_WORKER_MODE != "process": dxp_data, outcome, seconds = await loop.run_in_executor(SCRAPE_EXECUTOR, _scrape_job, rsn)
+        else:
+            dxp_data, outcome, seconds, worker_stats = await loop.run_in_executor(SCRAPE_EXECUTOR, _scrape_job_with_stats, rsn)
+            STATS.merge(worker_stats)
+    if report is not None: report.update(outcome=outcome, seconds=seconds)
+    return dxp_data
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls by key: while a call for a key is in flight, later callers await its
+    result instead of starting their own. The work runs as its own task, so a caller that is cancelled
+    (or times out) doesn't cancel it for the others. `stats` counts calls that did the work vs. joined one.
+    """
+    def __init__(self):
+        self._inflight = {} # key -> asyncio.Task
+        self.stats = {'started': 0, 'joined': 0}
+
+    def _done(self, key, task):
+        if self._inflight.get(key) is task: del self._inflight[key]
+        if not task.cancelled(): task.exception() # Mark retrieved even if every caller went away
+
+    async def run(self, key, coro_fn):
+        """Awaits coro_fn() or the in-flight call for `key`. Returns (result, joined) where joined means another call did the work."""
+        task, joined = self._inflight.get(key), True
+        if task is None:
+            task, joined = asyncio.ensure_future(coro_fn()), False
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        self.stats['joined' if joined else 'started'] += 1
+        return await asyncio.shield(task), joined
+
+    def stats_line(self) -> str:
+        return f"{self.stats['started']} started, {self.stats['joined']} joined an in-flight scrape"
+
+# One in-flight scrape per RSN across /getdxp calls, sweeps and background refreshes
+SCRAPE_FLIGHTS = SingleFlight()
+
+def _flight_key(rsn: str) -> str:
+    return rsn.strip().lower()
+
+# --- Core Logic: DXP Result Cache ---
+class DxpResultCache:
+    """
+    Thread-safe LRU cache of scrape results keyed by lower-cased RSN.
+    get() returns (dxp_data, fetched_at) for entries up to max_stale seconds old; is_fresh() tells
+    callers whether to also refresh in the background (stale-while-revalidate).
+    """
+    def __init__(self, ttl: float, max_stale: float, max_entries: int):
+        self.ttl, self.max_stale, self.max_entries = ttl, max_stale, max_entries
+        self._entries = OrderedDict() # rsn_key -> (dxp_data, fetched_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(rsn: str) -> str:
+        return rsn.strip().lower()
+
+    def get(self, rsn: str):
+        with self._lock:
+            entry = self._entries.get(self._key(rsn))
+            if entry is None: return None
+            if time.time() - entry[1] > self.max_stale:
+                del self._entries[self._key(rsn)]; return None
+            self._entries.move_to_end(self._key(rsn))
+            return entry
+
+    def put(self, rsn: str, dxp_data: DxpRecord, fetched_at: float = None, keep_newer: bool = False):
+        """Stores a successful result. Failed fetches (None) are never cached. With `keep_newer`, a more recent entry is kept."""
+        if dxp_data is None: return
+        with self._lock:
+            current = self._entries.get(self._key(rsn))
+            if keep_newer and current and fetched_at is not None and current[1] >= fetched_at: return
+            self._entries[self._key(rsn)] = (dxp_data, fetched_at if fetched_at is not None else time.time())
+            self._entries.move_to_end(self._key(rsn))
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at <= self.ttl
+
+    def begin_refresh(self, rsn: str) -> bool:
+        """Marks an RSN as refreshing. Returns False if a refresh is already running."""
+        with self._lock:
+            if self._key(rsn) in self._refreshing: return False
+            self._refreshing.add(self._key(rsn)); return True
+
+    def end_refresh(self, rsn: str):
+        with self._lock: self._refreshing.discard(self._key(rsn))
+
+DXP_CACHE = DxpResultCache(DXP_CACHE_TTL_SECONDS, DXP_CACHE_MAX_STALE_SECONDS, DXP_CACHE_MAX_ENTRIES)
+
+def align_cache_ttl(refresh_interval_seconds: float):
+    """
+    Keeps cached results fresh for as long as the background schedule takes to re-scrape them (plus 25% for the pass
+    itself), so /getdxp between passes doesn't start stale-while-revalidate scrapes the schedule is about to do anyway.
+    """
+    DXP_CACHE.ttl = max(DXP_CACHE_TTL_SECONDS, refresh_interval_seconds * 1.25)
+    DXP_CACHE.max_stale = max(DXP_CACHE_MAX_STALE_SECONDS, DXP_CACHE.ttl)
+_background_refresh_tasks = set() # Strong refs so refresh tasks aren't garbage collected mid-run
+
+def _schedule_background_refresh(discord_id: str, rsn: str):
+    """Re-scrapes a stale RSN in the background, updating DXP_CACHE and recording a snapshot."""
+    if not DXP_CACHE.begin_refresh(rsn): return
+    async def _refresh():
+        try:
+            started_at = time.time()
+            dxp_res, joined = await SCRAPE_FLIGHTS.run(_flight_key(rsn), lambda: scrape_player(rsn))
+            DXP_CACHE.put(rsn, dxp_res)
+            if dxp_res is not None and not joined: # A joined scrape is snapshotted by whoever started it
+                with STATS.timed("snapshot_write"):
+                    await asyncio.get_running_loop().run_in_executor(None, SNAPSHOT_STORE.record_sweep, started_at, [(discord_id, rsn, dxp_res, time.time())])
+        except Exception as e: print(f"Error: Background refresh failed for RSN {rsn}: {e}")
+        finally: DXP_CACHE.end_refresh(rsn)
+    task = asyncio.get_running_loop().create_task(_refresh())
+    _background_refresh_tasks.add(task)
+    task.add_done_callback(_background_refresh_tasks.discard)
+
+def _format_age(seconds: float) -> str:
+    """Human-friendly data age, e.g. 'just now', '45s ago', '3m ago', '1h 5m ago'."""
+    seconds = int(max(0, seconds))
+    if seconds < 10: return "just now"
+    if seconds < 60: return f"{seconds}s ago"
+    if seconds < 3600: return f"{seconds // 60}m ago"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m ago"
+
+# --- Core Logic: Adaptive Refresh Scheduling ---
+class AdaptiveRefreshScheduler:
+    """
+    Picks which players the adaptive refresh loop scrapes next, from each RSN's recent DXP gains, scrape
+    cost and failures. Players gaining DXP stay on the minimum interval; idle ones back off exponentially;
+    failing RSNs retry with jittered backoff until their circuit opens. due() stays within the per-minute budget.
+    """
+    def __init__(self, budget_per_minute: int, min_interval: float, max_interval: float, retry_base: float, breaker_failures: int, breaker_cooldown: float):
+        self.budget_per_minute, self.min_interval, self.max_interval = budget_per_minute, min_interval, max_interval
+        self.retry_base, self.breaker_failures, self.breaker_cooldown = retry_base, breaker_failures, breaker_cooldown
+        self._players = {} # rsn_key -> {'rsn', 'interval', 'next_due', 'last_total', 'last_gain', 'cost', 'failures', 'open_until'}
+        self._recent = deque() # Start times of scrapes handed out in the last 60 seconds
+
+    def _state(self, rsn: str, now: float) -> dict:
+        state = self._players.get(_flight_key(rsn))
+        if state is None:
+            cached = DXP_CACHE.get(rsn) # Seeded from the cache (warmed from snapshots on startup), so the first refresh already has a baseline
+            state = {'rsn': rsn, 'interval': self.min_interval, 'next_due': cached[1] + self.min_interval if cached else now,
+                     'last_total': cached[0].total() if cached else None, 'last_gain': 0, 'cost': None, 'failures': 0, 'open_until': None}
+            self._players[_flight_key(rsn)] = state
+        return state
+
+    def due(self, roster: list, now: float = None) -> list:
+        """Returns the [(discord_id, rsn), ...] from `roster` to scrape now: most DXP gained per second of scrape cost first, then longest overdue."""
+        now = time.time() if now is None else now
+        candidates = []
+        for did, rsn in roster:
+            state = self._state(rsn, now)
+            if state['next_due'] <= now: candidates.append((did, rsn, state))
+        roster_keys = {_flight_key(rsn) for _, rsn in roster}
+        for key in [k for k in self._players if k not in roster_keys]: del self._players[key] # Removed from the roster
+        while self._recent and self._recent[0] <= now - 60: self._recent.popleft()
+        candidates.sort(key=lambda c: (-c[2]['last_gain'] / max(c[2]['cost'] or 1.0, 0.1), c[2]['next_due']))
+        picked = candidates[:max(0, self.budget_per_minute - len(self._recent))]
+        self._recent.extend(now for _ in picked)
+        return [(did, rsn) for did, rsn, _ in picked]
+
+    def record(self, rsn: str, dxp_data, cost_seconds: float = None, now: float = None):
+        """Feeds one scrape result (a DxpRecord, or None if it failed) back into the RSN's schedule."""
+        now = time.time() if now is None else now
+        state = self._state(rsn, now)
+        if cost_seconds is not None: state['cost'] = cost_seconds if state['cost'] is None else 0.7 * state['cost'] + 0.3 * cost_seconds
+        if dxp_data is None:
+            state['failures'] += 1
+            if state['failures'] >= self.breaker_failures: # Also re-opens straight away if the post-cooldown probe fails
+                state['open_until'] = state['next_due'] = now + self.breaker_cooldown
+                print(f"Warning: Adaptive refresh - circuit open for RSN {rsn} after {state['failures']} failures in a row; skipping it for {self.breaker_cooldown / 60:.0f}m.")
+            else: # Jitter spreads out retries of RSNs that failed together (e.g. during a RunePixels outage)
+                backoff = min(self.max_interval, self.retry_base * 2 ** (state['failures'] - 1))
+                state['next_due'] = now + random.uniform(backoff / 2, backoff)
+            return
+        total = dxp_data.total()
+        if state['open_until']: print(f"Info: Adaptive refresh - circuit closed for RSN {rsn}.")
+        if state['last_total'] is not None: # First sample has nothing to compare against; keep the interval
+            state['last_gain'] = max(0, total - state['last_total'])
+            state['interval'] = self.min_interval if state['last_gain'] else min(self.max_interval, state['interval'] * 2)
+        state.update(last_total=total, failures=0, open_until=None, next_due=now + state['interval'])
+
+    def stats_line(self, now: float = None) -> str:
+        now = time.time() if now is None else now
+        states = list(self._players.values())
+        open_count = sum(1 for st in states if st['open_until'] and st['open_until'] > now)
+        active = sum(1 for st in states if st['last_gain'] and not st['failures'])
+        backed_off = sum(1 for st in states if st['interval'] > self.min_interval and not st['failures'])
+        recent = sum(1 for t in self._recent if t > now - 60)
+        return f"{active} active, {backed_off} backed off, {open_count} circuit open; {recent}/{self.budget_per_minute} scrapes in the last minute"
+
+ADAPTIVE_REFRESH = AdaptiveRefreshScheduler(ADAPTIVE_SCRAPE_BUDGET_PER_MINUTE, ADAPTIVE_MIN_INTERVAL_SECONDS, ADAPTIVE_MAX_INTERVAL_SECONDS,
+                                            ADAPTIVE_RETRY_BASE_SECONDS, ADAPTIVE_BREAKER_FAILURES, ADAPTIVE_BREAKER_COOLDOWN_SECONDS)
+
+# --- Core Logic: Roster Import ---
+_RSN_PATTERN = re.compile(r"^[A-Za-z0-9 _-]{1,12}$") # RuneScape names: up to 12 letters, digits, spaces, hyphens or underscores
+
+def parse_roster_csv(text: str):
+    """
+    Parses "discord_id,rsn" rows (an optional header row and <@mention> IDs are accepted).
+    Returns ({discord_id_str: rsn}, [(line_no, text, reason), ...] for rows that were rejected).
+    """
+    entries, rejected, seen_rsns = {}, [], {}
+    for line_no, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        if not any(cell.strip() for cell in row): continue
+        row_text = ",".join(row).strip()
+        if len(row) < 2: rejected.append((line_no, row_text, "expected discord_id,rsn")); continue
+        did, rsn = row[0].strip().strip("<@!>"), " ".join(row[1].split())
+        if line_no == 1 and not did.isdigit(): continue # Header row
+        owner = REGISTRY.find_by_rsn(rsn) if rsn else None
+        if not did.isdigit(): reason = "not a Discord user ID"
+        elif not _RSN_PATTERN.match(rsn): reason = "not a valid RSN"
+        elif did in entries: reason = "Discord ID listed twice"
+        elif rsn.lower() in seen_rsns: reason = f"RSN also listed on line {seen_rsns[rsn.lower()]}"
+        elif owner and owner != did: reason = f"RSN already tracked for <@{owner}>"
+        elif len(entries) >= IMPORT_MAX_ROWS: reason = f"over the {IMPORT_MAX_ROWS}-player import limit"
+        else:
+            entries[did], seen_rsns[rsn.lower()] = rsn, line_no; continue
+        rejected.append((line_no, row_text, reason))
+    return entries, rejected
+
+async def validate_rsns(rsns: list, warm_cache: bool = True, timeout: float = None) -> dict:
+    """
+    Checks each RSN against the fetch backends, at most IMPORT_VALIDATE_CONCURRENCY at a time (fresh cache hits count
+    as valid without scraping). Returns {rsn: (DxpRecord or None, outcome)}, where outcome is a fetch outcome
+    ("success", "not_found", "timeout", ...) or "unchecked" for RSNs still pending after `timeout` seconds.
+    With `warm_cache`, scraped data is kept in DXP_CACHE.
+    """
+    semaphore, expired = asyncio.Semaphore(IMPORT_VALIDATE_CONCURRENCY), []
+
+    async def _bounded_scrape(rsn, report):
+        async with semaphore:
+            if expired: return None # Queued past the timeout: don't start a scrape nobody is waiting for
+            return await scrape_player(rsn, report)
+
+    async def _validate(rsn):
+        cached = DXP_CACHE.get(rsn)
+        if cached and DXP_CACHE.is_fresh(cached[1]): return cached[0], "success"
+        report = {}
+        try: dxp_res = (await SCRAPE_FLIGHTS.run(_flight_key(rsn), lambda: _bounded_scrape(rsn, report)))[0]
+        except Exception as e:
+            print(f"Error: Validation scrape failed for RSN {rsn}: {e}"); dxp_res = None
+        if warm_cache: DXP_CACHE.put(rsn, dxp_res)
+        return dxp_res, report.get('outcome', "success" if dxp_res is not None else "error") # No report if it joined another scrape
+
+    pending = {asyncio.ensure_future(_validate(rsn)): rsn for rsn in rsns}
+    if not pending: return {}
+    done, not_done = await asyncio.wait(pending, timeout=timeout)
+    expired.append(True)
+    for task in not_done: task.cancel() # Scrapes already running finish in the background (SingleFlight shields them)
+    return {pending[task]: task.result() if task in done else (None, "unchecked") for task in pending}
+
+def _capped_lines(lines: list, limit: int = 1024) -> str:
+    """Joins lines for an embed field, ending with "...and N more" if they don't all fit in `limit` characters."""
+    text, shown = "", 0
+    for line in lines:
+        if len(text) + len(line) + 25 > limit: break # Leaves room for the "...and N more" line
+        text += ("\n" if text else "") + line; shown += 1
+    if shown < len(lines): text += f"\n...and {len(lines) - shown} more"
+    return text or "None"
+
+# --- Data Store: DXP Snapshots (SQLite) ---
+class DxpSnapshotStore:
+    """
+    SQLite history of DXP snapshots. Each sweep is written in a single transaction as one
+    player_snapshots row per player plus one skill_snapshots row per skill. Indexed on
+    (rsn_key, taken_at) so latest-per-player and "gain since" lookups stay cheap as history grows.
+    Opens a short-lived connection per call, so it is safe to use from executor threads.
+    """
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sweeps (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at REAL NOT NULL,
+        finished_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS player_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sweep_id INTEGER NOT NULL REFERENCES sweeps(id),
+        rsn_key TEXT NOT NULL,
+        rsn TEXT NOT NULL,
+        discord_id TEXT,
+        taken_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_player_snapshots_rsn_taken ON player_snapshots(rsn_key, taken_at);
+    CREATE TABLE IF NOT EXISTS skill_snapshots (
+        snapshot_id INTEGER NOT NULL REFERENCES player_snapshots(id),
+        skill TEXT NOT NULL,
+        dxp_raw TEXT NOT NULL,
+        dxp INTEGER, -- NULL when dxp_raw is a placeholder/non-numeric
+        PRIMARY KEY (snapshot_id, skill)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._schema_ready = False # Created on first use so importing the bot doesn't touch the disk
+        self._schema_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.execute("PRAGMA journal_mode=WAL") # Readers don't block the sweep writer
+                    conn.executescript(self._SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def record_sweep(self, started_at: float, player_results: list):
+        """
+        Writes one sweep in a single transaction.
+        player_results: [(discord_id, rsn, dxp_record, taken_at), ...]; entries with dxp_record None are skipped.
+        """
+        with contextlib.closing(self._connect()) as conn, conn:
+            sweep_id = conn.execute("INSERT INTO sweeps (started_at, finished_at) VALUES (?, ?)", (started_at, time.time())).lastrowid
+            for discord_id, rsn, dxp_record, taken_at in player_results:
+                if dxp_record is None: continue
+                snapshot_id = conn.execute(
+                    "INSERT INTO player_snapshots (sweep_id, rsn_key, rsn, discord_id, taken_at) VALUES (?, ?, ?, ?, ?)",
+                    (sweep_id, rsn.strip().lower(), rsn, discord_id, taken_at)).lastrowid
+                conn.executemany("INSERT OR REPLACE INTO skill_snapshots (snapshot_id, skill, dxp_raw, dxp) VALUES (?, ?, ?, ?)",
+                                 [(snapshot_id, SKILL_TABLE.names[skill_id], f"{value:,}" if value is not None else NO_DATA_PLACEHOLDER, value)
+                                  for skill_id, value in dxp_record.items()])
+        return sweep_id
+
+    _LATEST_PER_PLAYER = """
+        SELECT p.* FROM player_snapshots p
+        JOIN (SELECT rsn_key, MAX(taken_at) AS taken_at FROM player_snapshots GROUP BY rsn_key) latest
+          ON p.rsn_key = latest.rsn_key AND p.taken_at = latest.taken_at"""
+
+    def latest_snapshots(self):
+        """Returns {rsn_key: {'rsn', 'discord_id', 'taken_at', 'dxp_data': DxpRecord}} for each player's most recent snapshot."""
+        latest, skill_pairs = {}, defaultdict(list)
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(f"""
+                SELECT p.rsn_key, p.rsn, p.discord_id, p.taken_at, s.skill, s.dxp
+                FROM ({self._LATEST_PER_PLAYER}) p LEFT JOIN skill_snapshots s ON s.snapshot_id = p.id""")
+            for rsn_key, rsn, did, taken_at, skill, dxp in rows:
+                latest.setdefault(rsn_key, {'rsn': rsn, 'discord_id': did, 'taken_at': taken_at})
+                if skill is not None: skill_pairs[rsn_key].append((skill, dxp))
+        for rsn_key, entry in latest.items(): entry['dxp_data'] = DxpRecord.from_pairs(skill_pairs[rsn_key])
+        return latest
+
+    def gains_since(self, since_ts: float):
+        """
+        Per-player DXP gained from the last snapshot at/before `since_ts` (or the first one after it, if
+        none is that old) to the latest snapshot. Returns {rsn_key: {'rsn', 'discord_id', 'from', 'to', 'gains': {skill: int}}}.
+        """
+        gains = {}
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(f"""
+                WITH pairs AS (
+                    SELECT p.rsn_key, p.rsn, p.discord_id, p.id AS latest_id, p.taken_at AS latest_at, COALESCE(
+                        (SELECT b.id FROM player_snapshots b WHERE b.rsn_key = p.rsn_key AND b.taken_at <= ? ORDER BY b.taken_at DESC LIMIT 1),
+                        (SELECT b.id FROM player_snapshots b WHERE b.rsn_key = p.rsn_key AND b.taken_at > ? ORDER BY b.taken_at ASC LIMIT 1)) AS base_id
+                    FROM ({self._LATEST_PER_PLAYER}) p)
+                SELECT pairs.rsn_key, pairs.rsn, pairs.discord_id, base.taken_at, pairs.latest_at, ls.skill, ls.dxp - bs.dxp
+                FROM pairs JOIN player_snapshots base ON base.id = pairs.base_id
+                LEFT JOIN skill_snapshots ls ON ls.snapshot_id = pairs.latest_id
+                LEFT JOIN skill_snapshots bs ON bs.snapshot_id = pairs.base_id AND bs.skill = ls.skill""", (since_ts, since_ts))
+            for rsn_key, rsn, did, from_ts, to_ts, skill, gained in rows:
+                entry = gains.setdefault(rsn_key, {'rsn': rsn, 'discord_id': did, 'from': from_ts, 'to': to_ts, 'gains': {}})
+                if gained is not None: entry['gains'][skill] = gained
+        return gains
+
+SNAPSHOT_STORE = DxpSnapshotStore(SNAPSHOTS_DB_FILE)
+
 # --- Core Logic: Skill Best Calculation ---
-def calculate_skill_best_assignments(all_player_dxp_for_calc: dict, 
-                                     all_skill_names_in_data: list):
+def calculate_skill_best_assignments(all_player_dxp_for_calc: dict, all_skill_names_in_data: list):
+    """
+    Calculates "Skill Best" assignments with the solver selected by SKILL_BEST_SOLVER.
+    all_player_dxp_for_calc is {player_discord_name: DxpRecord}. Returns {skill_lower: player_discord_name}.
+    """
+    with STATS.timed("skill_best"):
+        if SKILL_BEST_SOLVER == "v13": # The original logic parses raw strings itself
+            raw_data = {p_name: record.to_raw() if record else {} for p_name, record in all_player_dxp_for_calc.items()}
+            return calculate_skill_best_assignments_v13(raw_data, all_skill_names_in_data)
+        return calculate_skill_best_assignments_indexed(all_player_dxp_for_calc, all_skill_names_in_data)
+
+def calculate_skill_best_assignments_indexed(all_player_dxp_for_calc: dict, all_skill_names_in_data: list):
+    """
+    Same result as the v13 logic, including its tie-breaking, but built on precomputed indexes:
+    - rank_index[skill][player] = (position in that skill's ranking, dxp), replacing ranking scans;
+    - first_open[skill] = position of the first ranked player with a free slot. Slots only ever fill up,
+      so this pointer only moves forward and "is this player the top available pick" is an O(1) check;
+    - held[player] = the player's assigned skills, replacing the rebuild of current_skills.
+    Each pass is O(players * skills) instead of O(players^2 * skills).
+    Takes {player_discord_name: DxpRecord}, so no DXP strings are parsed here.
+    """
+    print("Calculating Skill Best assignments...")
+    if not all_player_dxp_for_calc: return {}
+
+    rankings = defaultdict(list) # skill_lower -> [(player, dxp), ...] sorted by dxp desc (stable, as v13)
+    skill_keys = SKILL_TABLE.keys
+    for p_name, record in all_player_dxp_for_calc.items():
+        if not record: continue
+        for skill_id, d_val in record.items():
+            if d_val is None or skill_id == OVERALL_SKILL_ID: continue
+            rankings[skill_keys[skill_id]].append((p_name, d_val))
+    rank_index = {}
+    for s_l, ranking in rankings.items():
+        ranking.sort(key=lambda e: e[1], reverse=True)
+        positions = rank_index[s_l] = {}
+        for pos, (p_name, d_val) in enumerate(ranking):
+            if p_name not in positions: positions[p_name] = (pos, d_val) # First occurrence, as v13's scans
+    if not rankings:
+        print("Info: No numeric DXP (excl. 'Overall') for raw Skill Bests."); return {}
+
+    # 1. #1s claim their top skills
+    player_raw_wins = defaultdict(list)
+    for s_l, ranking in rankings.items(): player_raw_wins[ranking[0][0]].append((ranking[0][1], s_l))
+    final_assignments, player_slots, held = {}, defaultdict(int), defaultdict(list)
+    for p_name in sorted(player_raw_wins):
+        for dxp_v, s_l in sorted(player_raw_wins[p_name], key=lambda x: x[0], reverse=True):
+            if player_slots[p_name] < MAX_SKILLS_FOR_BEST_PLAYER and s_l not in final_assignments:
+                final_assignments[s_l] = p_name; player_slots[p_name] += 1; held[p_name].append(s_l)
+            else: break
+
+    candidate_skills = [s_l for s_l in all_skill_names_in_data if s_l != "overall" and s_l in rankings]
+    skill_order = {} # v13 tie-break: on equal DXP the skill listed first wins
+    for i, s_l in enumerate(candidate_skills): skill_order.setdefault(s_l, i)
+    first_open, registered_upto = dict.fromkeys(skill_order, 0), dict.fromkeys(skill_order, 0)
+    contender_skills = defaultdict(set) # player -> skills where nobody with a free slot outranks them
+    turn = {'player': None, 'queue': [], 'queued': set()}
+
+    def _advance_open(s_l):
+        """Moves first_open[s_l] past full players and registers everyone up to it as a contender for s_l."""
+        ranking, pos = rankings[s_l], first_open[s_l]
+        while pos < len(ranking) and player_slots[ranking[pos][0]] >= MAX_SKILLS_FOR_BEST_PLAYER: pos += 1
+        first_open[s_l] = pos
+        for i in range(registered_upto[s_l], min(pos + 1, len(ranking))):
+            cand_p = ranking[i][0]
+            if rank_index[s_l][cand_p][0] != i: continue # Only a player's first entry counts
+            contender_skills[cand_p].add(s_l)
+            if turn['player'] is not None and cand_p > turn['player'] and cand_p not in turn['queued']:
+                heapq.heappush(turn['queue'], cand_p); turn['queued'].add(cand_p) # Still gets a turn this pass
+        registered_upto[s_l] = max(registered_upto[s_l], pos + 1)
+    for s_l in skill_order: _advance_open(s_l)
+
+    # 2. Iterative Player-Preferred Roll-Down AND Upgrade Pass.
+    # Only contenders can find a candidate skill, so everyone else's turn (a no-op in v13) is skipped.
+    for pass_num in range(len(all_player_dxp_for_calc) + 5):
+        made_change = False
+        turn['queue'] = sorted(contender_skills); turn['queued'] = set(turn['queue'])
+        while turn['queue']:
+            p_name_turn = turn['player'] = heapq.heappop(turn['queue'])
+            best_s, best_dxp = None, None
+            for s_l in sorted(contender_skills[p_name_turn], key=skill_order.__getitem__):
+                owner = final_assignments.get(s_l, "")
+                if s_l in owner and owner == p_name_turn: continue # v13 quirk: own skill skipped only if its name is in the player's name
+                if s_l in final_assignments and owner != p_name_turn: continue # Taken by another player
+                entry = rank_index[s_l][p_name_turn]
+                if best_s is None or entry[1] > best_dxp: best_s, best_dxp = s_l, entry[1]
+            if best_s is None: continue
+
+            if player_slots[p_name_turn] < MAX_SKILLS_FOR_BEST_PLAYER:
+                if best_s not in final_assignments:
+                    final_assignments[best_s] = p_name_turn; player_slots[p_name_turn] += 1; held[p_name_turn].append(best_s)
+                    made_change = True
+                    if player_slots[p_name_turn] >= MAX_SKILLS_FOR_BEST_PLAYER:
+                        for s_l in skill_order: _advance_open(s_l)
+            elif held[p_name_turn]: # Player is full, check upgrade
+                current = held[p_name_turn]
+                worst_s = min(current, key=lambda s: rank_index[s][p_name_turn][1])
+                if best_dxp > rank_index[worst_s][p_name_turn][1]:
+                    del final_assignments[worst_s]; current.remove(worst_s)
+                    if best_s not in final_assignments: current.append(best_s)
+                    final_assignments[best_s] = p_name_turn # v13 quirk: may "upgrade" onto a skill already held
+                    made_change = True
+        turn['player'] = None
+        if not made_change: break
+    return final_assignments
+
+def calculate_skill_best_assignments_v13(all_player_dxp_for_calc: dict, 
+                                         all_skill_names_in_data: list):
     """
     Calculates "Skill Best" (v13 logic): 
     1. #1s claim. 
@@ -259,14 +1636,72 @@ intents = nextcord.Intents.default()
 intents.members = True # For resolving Member objects by ID
 bot = commands.Bot(owner_id=OWNER_ID, intents=intents) # No command_prefix for slash-only
 
+# --- Discord: Display Name Resolution ---
+class DisplayNameResolver:
+    """
+    Resolves Discord user ids to display names. Order: guild member cache (intents.members is on),
+    the bot's user cache, then a TTL cache of earlier lookups; only misses hit the REST API, with at most
+    NAME_RESOLVE_CONCURRENCY fetch_user calls in flight and concurrent lookups of one id sharing a call.
+    `stats` counts where names came from so the cache's effect can be checked.
+    """
+    def __init__(self, ttl: float, concurrency: int):
+        self.ttl, self.concurrency = ttl, concurrency
+        self._cache = {}     # user_id_str -> (display_name, expires_at)
+        self._inflight = {}  # user_id_str -> asyncio.Future
+        self._semaphore = None # Created on first use, inside the running loop
+        self.stats = {'member_cache': 0, 'ttl_hit': 0, 'fetched': 0, 'failed': 0}
+
+    def _from_gateway_cache(self, bot_instance, user_id: int, guild=None):
+        for g in ([guild] if guild else []) + list(bot_instance.guilds):
+            member = g.get_member(user_id)
+            if member: return member.display_name
+        user = bot_instance.get_user(user_id)
+        return user.display_name if user else None
+
+    async def resolve(self, bot_instance, user_id_str: str, guild=None) -> str:
+        """Returns the display name for a user id, falling back to the id itself if it can't be resolved."""
+        try: user_id = int(user_id_str)
+        except (TypeError, ValueError): return str(user_id_str)
+        name = self._from_gateway_cache(bot_instance, user_id, guild)
+        if name:
+            self.stats['member_cache'] += 1; return name
+        cached = self._cache.get(user_id_str)
+        if cached and cached[1] > time.monotonic():
+            self.stats['ttl_hit'] += 1; return cached[0]
+        if user_id_str in self._inflight: return await asyncio.shield(self._inflight[user_id_str])
+        future = self._inflight[user_id_str] = asyncio.get_running_loop().create_future()
+        name = user_id_str # Also what joined callers get if this lookup is cancelled
+        try:
+            if self._semaphore is None: self._semaphore = asyncio.Semaphore(self.concurrency)
+            async with self._semaphore:
+                with STATS.timed("name_lookup"): user = await bot_instance.fetch_user(user_id)
+            name = user.display_name if user else user_id_str
+            self._cache[user_id_str] = (name, time.monotonic() + self.ttl)
+            self.stats['fetched'] += 1
+        except Exception:
+            self.stats['failed'] += 1
+        finally:
+            del self._inflight[user_id_str]
+            future.set_result(name) # Even on cancellation, so callers that joined this lookup don't hang
+        return name
+
+    async def resolve_many(self, bot_instance, user_id_strs, guild=None) -> dict:
+        """Resolves many ids concurrently. Returns {user_id_str: display_name}."""
+        names = await asyncio.gather(*(self.resolve(bot_instance, uid, guild) for uid in user_id_strs))
+        return dict(zip(user_id_strs, names))
+
+    def stats_line(self) -> str:
+        return ", ".join(f"{v} {k.replace('_', ' ')}" for k, v in self.stats.items())
+
+DISPLAY_NAMES = DisplayNameResolver(NAME_CACHE_TTL_SECONDS, NAME_RESOLVE_CONCURRENCY)
+
 # --- Permission Checks ---
 async def is_owner_check(interaction: nextcord.Interaction) -> bool:
     return interaction.user.id == bot.owner_id
 
 async def is_admin_or_owner_check(interaction: nextcord.Interaction) -> bool:
     if interaction.user.id == bot.owner_id: return True
-    admins = load_json_data_corrected(ADMINS_FILE, default_type_factory=list)
-    return interaction.user.id in admins
+    return REGISTRY.is_admin(interaction.user.id)
 
 # --- Bot Events ---
 @bot.event
@@ -278,15 +1713,70 @@ async def on_ready():
     if not os.path.exists(ADMINS_FILE): save_json_data([], ADMINS_FILE)
     guild_text = f"guild {TEST_GUILD_ID}" if TEST_GUILD_ID else "globally"
     print(f"Slash commands will attempt to register for {guild_text}.")
+    if HttpDxpFetcher.name in FETCH_BACKENDS and urllib.parse.urlparse(RUNEPIXELS_BASE_URL).hostname in ("runepixels.com", "www.runepixels.com"):
+        print(f"Warning: The '{HttpDxpFetcher.name}' fetch backend can't read RunePixels' client-side rendered pages; it only adds a wasted request per scrape. Remove it from FETCH_BACKENDS.")
+    # Warm the /getdxp cache from the latest stored snapshots (entries past DXP_CACHE_MAX_STALE_SECONDS are ignored on read).
+    # on_ready also runs after every gateway reconnect, so cached results newer than a snapshot are kept.
+    latest = await asyncio.get_running_loop().run_in_executor(None, SNAPSHOT_STORE.latest_snapshots)
+    for snap in latest.values(): DXP_CACHE.put(snap['rsn'], snap['dxp_data'], fetched_at=snap['taken_at'], keep_newer=True)
+    if latest: print(f"Info: Warmed DXP cache with {len(latest)} stored snapshots.")
+    if ADAPTIVE_REFRESH_ENABLED and not adaptive_refresh_tick.is_running():
+        adaptive_refresh_tick.start()
+        align_cache_ttl(ADAPTIVE_MAX_INTERVAL_SECONDS) # Active players are re-scraped far sooner; idle ones don't change
+        print(f"Info: Adaptive refresh every {ADAPTIVE_TICK_SECONDS}s, up to {ADAPTIVE_SCRAPE_BUDGET_PER_MINUTE} scrapes a minute.")
+    elif SCHEDULED_SCRAPE_ENABLED and not scheduled_roster_sweep.is_running():
+        scheduled_roster_sweep.start()
+        align_cache_ttl(SCHEDULED_SCRAPE_INTERVAL_MINUTES * 60)
+        print(f"Info: Scheduled roster sweeps every {SCHEDULED_SCRAPE_INTERVAL_MINUTES} minutes.")
+    if STATS_PROMETHEUS_FILE and not prometheus_stats_dump.is_running():
+        prometheus_stats_dump.start()
+        print(f"Info: Writing Prometheus stats to '{STATS_PROMETHEUS_FILE}' every {STATS_PROMETHEUS_INTERVAL_SECONDS}s.")
+
+# --- Background Tasks ---
+@tasks.loop(minutes=SCHEDULED_SCRAPE_INTERVAL_MINUTES)
+async def scheduled_roster_sweep():
+    """Scrapes the whole roster; fetch_dxp_for_command stores the snapshots and refreshes DXP_CACHE."""
+    sweep_start = time.monotonic()
+    try:
+        results = await fetch_dxp_for_command(bot, force=True)
+        ok_count = sum(1 for r in results.values() if isinstance(r, dict) and r.get('dxp_data') is not None)
+        print(f"Info: Scheduled sweep scraped {ok_count}/{len(results)} players in {time.monotonic() - sweep_start:.1f}s.")
+    except Exception as e:
+        print(f"Error: Scheduled sweep failed: {e}")
+
+@scheduled_roster_sweep.before_loop
+async def _before_scheduled_roster_sweep():
+    await bot.wait_until_ready()
+
+@tasks.loop(seconds=ADAPTIVE_TICK_SECONDS)
+async def adaptive_refresh_tick():
+    """Scrapes the players ADAPTIVE_REFRESH says are due and feeds each outcome back into their schedule."""
+    due = ADAPTIVE_REFRESH.due(REGISTRY.roster())
+    if not due: return
+    async def _on_result(did_s, entry, total_players):
+        ADAPTIVE_REFRESH.record(entry['rsn'], entry['dxp_data'], entry.get('scrape_seconds'))
+    try:
+        results = await fetch_dxp_for_command(bot, force=True, on_result=_on_result, discord_ids={did for did, _ in due})
+        ok_count = sum(1 for r in results.values() if isinstance(r, dict) and r.get('dxp_data') is not None)
+        print(f"Info: Adaptive refresh scraped {ok_count}/{len(due)} due players - {ADAPTIVE_REFRESH.stats_line()}.")
+    except Exception as e:
+        print(f"Error: Adaptive refresh failed: {e}")
+
+@adaptive_refresh_tick.before_loop
+async def _before_adaptive_refresh_tick():
+    await bot.wait_until_ready()
+
+@tasks.loop(seconds=STATS_PROMETHEUS_INTERVAL_SECONDS)
+async def prometheus_stats_dump():
+    """Rewrites STATS_PROMETHEUS_FILE with the current stage timings and scrape outcome counters."""
+    await asyncio.get_running_loop().run_in_executor(None, write_prometheus_file, STATS_PROMETHEUS_FILE)
 
 # --- Slash Commands ---
 @bot.slash_command(name="addadmin", description="OWNER: Adds a bot admin.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
 async def add_admin_slash(interaction: nextcord.Interaction, user: nextcord.Member = nextcord.SlashOption(description="The user to make an admin.")):
     if not await is_owner_check(interaction):
         await interaction.response.send_message("⛔ Only the bot owner can use this command.", ephemeral=True); return
-    admins = load_json_data_corrected(ADMINS_FILE, default_type_factory=list)
-    if user.id not in admins:
-        admins.append(user.id); save_json_data(admins, ADMINS_FILE)
+    if REGISTRY.add_admin(user.id):
         await interaction.response.send_message(f"✅ {user.mention} is now an admin.", ephemeral=True)
     else: await interaction.response.send_message(f"⚠️ {user.mention} is already an admin.", ephemeral=True)
 
@@ -294,22 +1784,42 @@ async def add_admin_slash(interaction: nextcord.Interaction, user: nextcord.Memb
 async def remove_admin_slash(interaction: nextcord.Interaction, user: nextcord.Member = nextcord.SlashOption(description="The admin to remove.")):
     if not await is_owner_check(interaction):
         await interaction.response.send_message("⛔ Only the bot owner can use this command.", ephemeral=True); return
-    admins = load_json_data_corrected(ADMINS_FILE, default_type_factory=list)
-    if user.id in admins:
-        try: admins.remove(user.id); save_json_data(admins, ADMINS_FILE)
-        except ValueError: pass 
+    if REGISTRY.remove_admin(user.id):
         await interaction.response.send_message(f"✅ {user.mention} is no longer an admin.", ephemeral=True)
     else: await interaction.response.send_message(f"⚠️ {user.mention} is not an admin.", ephemeral=True)
 
+@bot.slash_command(name="botstats", description="OWNER: Shows stage timings and scrape outcome counters.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
+async def bot_stats_slash(interaction: nextcord.Interaction):
+    if not await is_owner_check(interaction):
+        await interaction.response.send_message("⛔ Only the bot owner can use this command.", ephemeral=True); return
+    fmt = lambda seconds: f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+    rows = [f"{stage:<15}{st['count']:>5}{fmt(st['p50']):>9}{fmt(st['p95']):>9}{fmt(st['max']):>9}" for stage, st in STATS.summary().items() if st]
+    desc = "```\n" + "\n".join([f"{'stage':<15}{'n':>5}{'p50':>9}{'p95':>9}{'max':>9}"] + rows) + "\n```" if rows else "No timings recorded yet."
+    embed = nextcord.Embed(title="📊 Bot Stats", description=desc, color=nextcord.Color.blue(), timestamp=datetime.datetime.now(datetime.timezone.utc))
+    totals = STATS.outcome_totals()
+    embed.add_field(name="Scrape outcomes", value=", ".join(f"{n} {outcome}" for outcome, n in sorted(totals.items())) or "None yet.", inline=False)
+    worst = STATS.worst_rsns(10)
+    if worst:
+        lines = [f"{rsn}: {o.get('timeout', 0)} timeouts, {o.get('error', 0)} errors, {o.get('success', 0)} ok" for rsn, o in worst]
+        embed.add_field(name="Most failing RSNs", value="\n".join(lines)[:1024], inline=False)
+    attempts = STATS.attempt_totals()
+    if attempts:
+        lines = [f"{backend}: " + ", ".join(f"{n} {outcome}" for outcome, n in sorted(o.items())) for backend, o in sorted(attempts.items())]
+        embed.add_field(name="Fetch attempts per backend", value="\n".join(lines)[:1024], inline=False)
+    embed.add_field(name="Scrape coalescing", value=SCRAPE_FLIGHTS.stats_line(), inline=False)
+    if ADAPTIVE_REFRESH_ENABLED: embed.add_field(name="Adaptive refresh", value=ADAPTIVE_REFRESH.stats_line(), inline=False)
+    embed.add_field(name="Display names", value=DISPLAY_NAMES.stats_line(), inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 @bot.slash_command(name="addplayer", description="ADMIN: Adds/updates a player's RSN for DXP tracking.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
 async def add_player_slash(interaction: nextcord.Interaction, 
                            user: nextcord.Member = nextcord.SlashOption(description="The Discord user."), 
                            rsn: str = nextcord.SlashOption(description="The RuneScape Name (RSN).")):
     if not await is_admin_or_owner_check(interaction):
         await interaction.response.send_message("⛔ You don't have permission for this command.", ephemeral=True); return
-    players = load_json_data_corrected(PLAYERS_FILE, default_type_factory=dict)
-    players[str(user.id)] = {"rsn": rsn.strip(), "added_by": str(interaction.user.id), "date_added": datetime.datetime.utcnow().isoformat()}
-    save_json_data(players, PLAYERS_FILE)
+    conflicts = REGISTRY.claim_players({str(user.id): {"rsn": rsn.strip(), "added_by": str(interaction.user.id), "date_added": datetime.datetime.utcnow().isoformat()}})
+    if conflicts:
+        await interaction.response.send_message(f"⚠️ **{rsn.strip()}** is already tracked for <@{conflicts[str(user.id)]}>. Remove it there first.", ephemeral=True); return
     await interaction.response.send_message(f"✅ Player **{rsn.strip()}** set for {user.mention}.", ephemeral=True)
 
 @bot.slash_command(name="removeplayer", description="ADMIN: Removes a player from DXP tracking.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
@@ -317,56 +1827,317 @@ async def remove_player_slash(interaction: nextcord.Interaction,
                               user: nextcord.Member = nextcord.SlashOption(description="The Discord user whose RSN to remove.")):
     if not await is_admin_or_owner_check(interaction):
         await interaction.response.send_message("⛔ You don't have permission for this command.", ephemeral=True); return
-    players = load_json_data_corrected(PLAYERS_FILE, default_type_factory=dict)
-    uid_str = str(user.id)
-    if uid_str in players:
-        removed_entry = players.pop(uid_str); save_json_data(players, PLAYERS_FILE)
+    removed_entry = REGISTRY.remove_player(str(user.id))
+    if removed_entry is not None:
         rsn_val = removed_entry.get("rsn", "Unknown RSN")
         await interaction.response.send_message(f"✅ Player **{rsn_val}** for {user.mention} removed from tracking.", ephemeral=True)
     else: await interaction.response.send_message(f"⚠️ {user.mention} not found in tracking list.", ephemeral=True)
 
-async def fetch_dxp_for_command(bot_instance: commands.Bot, target_discord_id_str: str = None):
-    """Helper to fetch DXP data for target(s) using ThreadPoolExecutor."""
+@bot.slash_command(name="importplayers", description="ADMIN: Adds/updates many players from a CSV of discord_id,rsn rows.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
+async def import_players_slash(interaction: nextcord.Interaction,
+                               file: nextcord.Attachment = nextcord.SlashOption(description="CSV file with one discord_id,rsn row per player."),
+                               validate: bool = nextcord.SlashOption(description="Check every RSN on RunePixels before adding it (default True).", required=False, default=True),
+                               warm_cache: bool = nextcord.SlashOption(description="Keep the validation scrapes as cached DXP data (default True).", required=False, default=True)):
+    if not await is_admin_or_owner_check(interaction):
+        await interaction.response.send_message("⛔ You don't have permission for this command.", ephemeral=True); return
+    if file.size > IMPORT_MAX_BYTES:
+        await interaction.response.send_message(f"⚠️ That file is too large (max {IMPORT_MAX_BYTES // 1024} KB).", ephemeral=True); return
+    await interaction.response.defer(ephemeral=True)
+    try: text = (await file.read()).decode("utf-8-sig")
+    except (nextcord.HTTPException, UnicodeDecodeError) as e:
+        await interaction.edit_original_message(content=f"⚠️ Could not read `{file.filename}` as UTF-8 text: {e}"); return
+
+    entries, rejected = parse_roster_csv(text)
+    unresolved = [] # Couldn't be checked (timeouts, errors, out of time): added anyway, verified by the next scrape
+    if validate and entries:
+        await interaction.edit_original_message(content=f"⏳ Validating {len(entries)} RSNs on RunePixels...")
+        deadline = time.monotonic() + IMPORT_VALIDATE_TIMEOUT_SECONDS
+        checked = await validate_rsns(list(entries.values()), warm_cache, timeout=IMPORT_VALIDATE_TIMEOUT_SECONDS)
+        retry = [rsn for rsn, (dxp_res, outcome) in checked.items() if dxp_res is None and outcome not in ("not_found", "unchecked")]
+        if retry and deadline - time.monotonic() > 0: # One more try for transient failures
+            await interaction.edit_original_message(content=f"⏳ Retrying {len(retry)} RSNs that could not be checked...")
+            checked.update(await validate_rsns(retry, warm_cache, timeout=deadline - time.monotonic()))
+        for did, rsn in list(entries.items()):
+            dxp_res, outcome = checked[rsn]
+            if outcome == "not_found":
+                del entries[did]; rejected.append((None, f"{did},{rsn}", "RSN not found on RunePixels"))
+            elif dxp_res is None: unresolved.append((did, rsn))
+    if entries: # One registry change, so players_data.json is written once however many players were imported
+        added_at = datetime.datetime.utcnow().isoformat()
+        conflicts = REGISTRY.claim_players({did: {"rsn": rsn, "added_by": str(interaction.user.id), "date_added": added_at} for did, rsn in entries.items()})
+        for did, owner in conflicts.items(): # Claimed (e.g. by /addplayer) while this import was validating
+            rejected.append((None, f"{did},{entries.pop(did)}", f"RSN now tracked for <@{owner}>"))
+        unresolved = [(did, rsn) for did, rsn in unresolved if did in entries]
+    accepted = [(did, rsn) for did, rsn in entries.items() if (did, rsn) not in unresolved]
+    print(f"Info: /importplayers by {interaction.user.id} - {len(accepted)} accepted, {len(rejected)} rejected, {len(unresolved)} unresolved.")
+
+    embed = nextcord.Embed(title=f"📥 Player Import: {file.filename}", color=nextcord.Color.green() if entries else nextcord.Color.orange(), timestamp=datetime.datetime.now(datetime.timezone.utc))
+    embed.add_field(name=f"✅ Accepted ({len(accepted)})", value=_capped_lines([f"<@{did}> → {rsn}" for did, rsn in accepted]), inline=False)
+    embed.add_field(name=f"⛔ Rejected ({len(rejected)})", value=_capped_lines([(f"Line {n}: " if n else "") + f"`{row[:40]}` - {reason}" for n, row, reason in rejected]), inline=False)
+    if validate: embed.add_field(name=f"❓ Unresolved: could not be checked, added anyway ({len(unresolved)})", value=_capped_lines([f"<@{did}> → {rsn}" for did, rsn in unresolved]), inline=False)
+    await interaction.edit_original_message(content=None, embed=embed)
+
+async def fetch_dxp_for_command(bot_instance: commands.Bot, target_discord_id_str: str = None, force: bool = False, on_result=None, guild=None, discord_ids=None):
+    """
+    Helper to fetch DXP data for target(s), serving from DXP_CACHE unless `force` and scraping the rest.
+    If given, `await on_result(discord_id, result, total_players)` is called as each player's result arrives.
+    `guild` is checked first when resolving display names. `discord_ids` limits an all-players fetch to those players.
+    """
     results = {}
-    player_data_store = load_json_data_corrected(PLAYERS_FILE, default_type_factory=dict)
-    if not player_data_store: return {"error": "No players are registered yet."} if target_discord_id_str else {}
+    roster = REGISTRY.roster()
+    if not roster: return {"error": "No players are registered yet."} if target_discord_id_str else {}
 
     tasks_to_run = []
     if target_discord_id_str:
-        player_entry = player_data_store.get(target_discord_id_str)
-        if player_entry and isinstance(player_entry, dict) and player_entry.get("rsn"):
+        player_entry = REGISTRY.get_player(target_discord_id_str)
+        if player_entry and player_entry.get("rsn"):
             tasks_to_run.append({'discord_id': target_discord_id_str, 'rsn': player_entry["rsn"]})
         else:
-            target_member_for_error_msg = f"User ID {target_discord_id_str}"
-            try: user_obj = await bot_instance.fetch_user(int(target_discord_id_str)); target_member_for_error_msg = user_obj.mention
-            except: pass
-            return {"error": f"{target_member_for_error_msg} is not registered or has no RSN set."}
+            return {"error": f"<@{target_discord_id_str}> is not registered or has no RSN set."}
     else: # Fetch for all
-        for did, p_info in player_data_store.items():
-            if isinstance(p_info, dict) and p_info.get("rsn"):
-                 tasks_to_run.append({'discord_id': did, 'rsn': p_info["rsn"]})
+        tasks_to_run = [{'discord_id': did, 'rsn': rsn} for did, rsn in roster if discord_ids is None or did in discord_ids]
     
     if not tasks_to_run: return {} if not target_discord_id_str else {"error": "No valid RSN found for the specified user."}
 
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PLAYERS) as executor:
-        future_to_task = {loop.run_in_executor(executor, get_player_dxp_data, t['rsn']): t for t in tasks_to_run}
-        for future in concurrent.futures.as_completed(future_to_task):
-            task = future_to_task[future]; did_s, rsn_s = task['discord_id'], task['rsn']
-            d_name = did_s 
-            try: user_o = await bot_instance.fetch_user(int(did_s)); d_name = user_o.display_name if user_o else did_s
-            except: pass
-            try:
-                dxp_res = await future
-                results[did_s] = {'rsn': rsn_s, 'discord_name': d_name, 'dxp_data': dxp_res}
-            except Exception as e:
-                print(f"Error processing future for RSN {rsn_s}: {e}")
-                results[did_s] = {'rsn': rsn_s, 'discord_name': d_name, 'dxp_data': None}
+    async def _resolve_name(did_s):
+        return await DISPLAY_NAMES.resolve(bot_instance, did_s, guild)
+
+    async def _emit(did_s, entry):
+        results[did_s] = entry
+        if on_result:
+            try: await on_result(did_s, entry, len(tasks_to_run))
+            except Exception as e: print(f"Error: on_result callback failed for {did_s}: {e}")
+
+    tasks_to_scrape, cached_hits, stale_count = [], [], 0
+    for task in tasks_to_run:
+        cached = None if force else DXP_CACHE.get(task['rsn'])
+        if cached is None: tasks_to_scrape.append(task); continue
+        cached_hits.append((task, cached))
+        if not DXP_CACHE.is_fresh(cached[1]):
+            stale_count += 1; _schedule_background_refresh(task['discord_id'], task['rsn'])
+    if cached_hits: # Resolve every cached player's name in one concurrent batch
+        names = await DISPLAY_NAMES.resolve_many(bot_instance, [task['discord_id'] for task, _ in cached_hits], guild)
+        for task, (dxp_res, fetched_at) in cached_hits:
+            await _emit(task['discord_id'], {'rsn': task['rsn'], 'discord_name': names[task['discord_id']], 'dxp_data': dxp_res, 'fetched_at': fetched_at})
+    print(f"Info: DXP cache - {len(tasks_to_run) - len(tasks_to_scrape) - stale_count} fresh, {stale_count} stale (refreshing), {len(tasks_to_scrape)} to scrape{' (forced)' if force else ''}.")
+    if not tasks_to_scrape: return results
+
+    sweep_started_at = time.time()
+    loop = asyncio.get_running_loop()
+    coalesced = {'joined': 0}
+
+    async def _scrape(task):
+        """
+        Scrapes one player via scrape_player (bounded by its global scrape slots) while resolving their name concurrently.
+        If another command, sweep or refresh is already scraping this RSN, its result is shared instead.
+        """
+        name_task = asyncio.ensure_future(_resolve_name(task['discord_id']))
+        report, joined = {}, False
+        try:
+            dxp_res, joined = await SCRAPE_FLIGHTS.run(_flight_key(task['rsn']), lambda: scrape_player(task['rsn'], report))
+            coalesced['joined'] += joined
+        except Exception as e:
+            print(f"Error: Scrape failed for RSN {task['rsn']}: {e}"); dxp_res = None
+        DXP_CACHE.put(task['rsn'], dxp_res)
+        scrape_seconds = None if joined else report.get('seconds') # Joined flights did no work of their own: no cost sample
+        return task, {'rsn': task['rsn'], 'discord_name': await name_task, 'dxp_data': dxp_res, 'fetched_at': time.time() if dxp_res is not None else None, 'scrape_seconds': scrape_seconds}
+
+    for next_done in asyncio.as_completed([_scrape(t) for t in tasks_to_scrape]): # Stream results as each player finishes
+        task, entry = await next_done
+        await _emit(task['discord_id'], entry)
+    scraped_ids = {t['discord_id'] for t in tasks_to_scrape}
+    snapshot_rows = [(did_s, r['rsn'], r['dxp_data'], r['fetched_at']) for did_s, r in results.items() if did_s in scraped_ids and r['dxp_data'] is not None]
+    if snapshot_rows:
+        try:
+            with STATS.timed("snapshot_write"): await loop.run_in_executor(None, SNAPSHOT_STORE.record_sweep, sweep_started_at, snapshot_rows)
+        except Exception as e: print(f"Error: Could not store DXP snapshots: {e}")
+    if coalesced['joined']: print(f"Info: {coalesced['joined']}/{len(tasks_to_scrape)} scrapes joined an in-flight scrape for the same RSN.")
+    print(f"Info: Scrape coalescing so far - {SCRAPE_FLIGHTS.stats_line()}.")
+    print(f"Info: Display names so far - {DISPLAY_NAMES.stats_line()}.")
+    readiness = summarize_readiness_timings()
+    if readiness:
+        print(f"Info: Page readiness over last {readiness['count']} pages - p50 {readiness['p50']:.2f}s, p95 {readiness['p95']:.2f}s, max {readiness['max']:.2f}s.")
     return results
 
+class LeaderboardPages:
+    """
+    The Overall DXP leaderboard, sorted once into a list so any page is a cheap slice.
+    render(page) builds that page's embed on demand (data ages are computed at render time).
+    """
+    def __init__(self, fetched_player_dxp_results: dict, timestamp, title_suffix: str = "", page_size: int = LEADERBOARD_PAGE_SIZE):
+        self.timestamp, self.title_suffix, self.page_size = timestamp, title_suffix, page_size
+        self.entries = [(data['dxp_data'].total(), data['discord_name'], data['rsn'], data.get('fetched_at'))
+                        for data in fetched_player_dxp_results.values() if data.get('dxp_data')]
+        self.entries.sort(key=lambda e: e[0], reverse=True)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.entries) // self.page_size))
+
+    def render(self, page: int) -> nextcord.Embed:
+        first = page * self.page_size
+        fetch_time_now = time.time()
+        lines = [f"{first+i+1}. **{name}** ({rsn}): `{total:,}` DXP" + (f" · _{_format_age(fetch_time_now - fetched_at)}_" if fetched_at else "")
+                 for i, (total, name, rsn, fetched_at) in enumerate(self.entries[first:first + self.page_size])]
+        desc1 = "\n".join(lines) or "No DXP data for leaderboard."
+        embed = nextcord.Embed(title=f"🏆 Overall DXP Leaderboard (Calculated){self.title_suffix}", description=desc1[:4090]+"..." if len(desc1)>4096 else desc1, color=nextcord.Color.gold(), timestamp=self.timestamp)
+        if self.page_count > 1: embed.set_footer(text=f"Page {page + 1}/{self.page_count} · {len(self.entries)} players")
+        return embed
+
+class SkillBestPages:
+    """Skill Best assignments computed once, rendered MAX_EMBED_FIELDS skills (one field each) per page."""
+    def __init__(self, rows: list, timestamp, page_size: int = MAX_EMBED_FIELDS):
+        self.rows, self.timestamp, self.page_size = rows, timestamp, page_size # rows: [(skill_display, player, dxp or None)]
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.rows) // self.page_size))
+
+    def render(self, page: int) -> nextcord.Embed:
+        embed = nextcord.Embed(title="✨ Skill Best Assignments (Event DXP)", color=nextcord.Color.purple(), timestamp=self.timestamp)
+        for skill, player, dxp in self.rows[page * self.page_size:(page + 1) * self.page_size]:
+            embed.add_field(name=skill, value=f"{player} ({_format_dxp_for_display(dxp, True)})"[:1024], inline=True)
+        if not self.rows: embed.description = "No Skill Best data to display."
+        if self.page_count > 1: embed.set_footer(text=f"Page {page + 1}/{self.page_count} · {len(self.rows)} skills")
+        return embed
+
+def build_leaderboard_embed(fetched_player_dxp_results: dict, timestamp, title_suffix: str = ""):
+    """Builds the first page of the Overall DXP Leaderboard from fetch_dxp_for_command results (complete or partial)."""
+    return LeaderboardPages(fetched_player_dxp_results, timestamp, title_suffix).render(0)
+
+def build_skill_best_pages(fetched_player_dxp_results: dict, timestamp):
+    """Applies the Skill Best cutoff and runs the solver once. Returns SkillBestPages, or None if nothing is eligible."""
+    data_for_skill_best_calc = {data['discord_name']: data['dxp_data'] for discord_id, data in fetched_player_dxp_results.items() if data.get('dxp_data')}
+
+    # --- Apply SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME ---
+    eligible_for_sb_discord = {}
+    if SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME and SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME.strip():
+        cutoff_name_lower = SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME.strip().lower()
+        # We need a way to get players in their configured order to apply cutoff
+        # For now, this cutoff might be tricky if player_data_store isn't ordered or if discord_name isn't unique
+        # A simple approach: exclude players at or after the cutoff name if found.
+        # This assumes unique discord_names from fetched_player_dxp_results for simplicity of example.
+        # A more robust solution would map PLAYER_SHEET_COLUMN_NAMES (if they are Discord names) to RSNs/Discord IDs.
+
+        # Simpler filter: iterate through players in the order they are in PLAYER_SHEET_COLUMN_NAMES
+        # and stop if cutoff is reached. This requires PLAYER_SHEET_COLUMN_NAMES to be discord_names
+        # or a mapping. For this example, the current cutoff is based on player *display names*.
+
+        temp_player_list_for_cutoff = [] # List of (discord_name, data_dict)
+        # Attempt to get a somewhat consistent order for cutoff, though dict iteration isn't guaranteed
+        for p_name_key_in_calc in sorted(data_for_skill_best_calc.keys()): # p_name_key_in_calc is discord_name
+            if p_name_key_in_calc.lower() == cutoff_name_lower:
+                break # Stop adding players once cutoff is reached
+            temp_player_list_for_cutoff.append((p_name_key_in_calc, data_for_skill_best_calc[p_name_key_in_calc]))
+
+        if len(temp_player_list_for_cutoff) < len(data_for_skill_best_calc) and \
+           any(p_name.lower() == cutoff_name_lower for p_name in data_for_skill_best_calc.keys()):
+            eligible_for_sb_discord = dict(temp_player_list_for_cutoff)
+            print(f"Info: For Discord Skill Best, considering {len(eligible_for_sb_discord)} players appearing before '{SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME}'.")
+        else: # Cutoff name not found or no one before it
+            print(f"Warning: Cutoff player '{SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME}' not effective or not found. Considering all for Discord Skill Best.")
+            eligible_for_sb_discord = data_for_skill_best_calc
+    else:
+        print("Info: No cutoff player for Discord Skill Best. Considering all.")
+        eligible_for_sb_discord = data_for_skill_best_calc
+
+    all_skill_names = set(SKILL_TABLE.keys[skill_id] for record in eligible_for_sb_discord.values() for skill_id in record.order)
+    if not (eligible_for_sb_discord and all_skill_names): return None
+    skill_best_assignments = calculate_skill_best_assignments(eligible_for_sb_discord, list(all_skill_names - {"overall"}))
+    rows = []
+    for skill_l in sorted(skill_best_assignments):
+        bp_name = skill_best_assignments[skill_l]
+        bp_record = eligible_for_sb_discord.get(bp_name)
+        rows.append((skill_l.capitalize(), bp_name, bp_record.get(SKILL_TABLE.id_for(skill_l)) if bp_record else None))
+    return SkillBestPages(rows, timestamp)
+
+def build_skill_best_embed(fetched_player_dxp_results: dict, timestamp):
+    """Builds the first Skill Best page. Returns None if nothing is eligible."""
+    pages = build_skill_best_pages(fetched_player_dxp_results, timestamp)
+    return pages.render(0) if pages else None
+
+class DxpResultsView(nextcord.ui.View):
+    """
+    Prev/next buttons for the /getdxp leaderboard and Skill Best embeds (one button row each).
+    Pages are rendered on demand from the results computed once for the command, so clicks never re-scrape or re-solve.
+    Only `owner_id` (the user who ran the command) can turn pages, so one viewer can't move the page under another.
+    """
+    def __init__(self, *books, owner_id: int = None, timeout: float = RESULTS_VIEW_TIMEOUT_SECONDS):
+        super().__init__(timeout=timeout)
+        self.owner_id = owner_id
+        self.books = [book for book in books if book][:MAX_EMBEDS_PER_MESSAGE]
+        self.current = [0] * len(self.books)
+        self.message = None # Set by the sender, so buttons can be disabled on timeout
+        self._buttons = []
+        for row, book in enumerate(self.books):
+            if book.page_count <= 1: continue
+            prev_btn = nextcord.ui.Button(emoji="◀️", style=nextcord.ButtonStyle.secondary, row=row)
+            page_btn = nextcord.ui.Button(label="", style=nextcord.ButtonStyle.secondary, row=row, disabled=True)
+            next_btn = nextcord.ui.Button(emoji="▶️", style=nextcord.ButtonStyle.secondary, row=row)
+            prev_btn.callback, next_btn.callback = self._turn(row, -1), self._turn(row, 1)
+            for btn in (prev_btn, page_btn, next_btn): self.add_item(btn)
+            self._buttons.append((row, prev_btn, page_btn, next_btn))
+        self._sync()
+
+    def _sync(self):
+        for row, prev_btn, page_btn, next_btn in self._buttons:
+            page, count = self.current[row], self.books[row].page_count
+            prev_btn.disabled, next_btn.disabled = page == 0, page >= count - 1
+            page_btn.label = f"{'Leaderboard' if isinstance(self.books[row], LeaderboardPages) else 'Skill Best'} {page + 1}/{count}"
+
+    def _turn(self, row: int, step: int):
+        async def callback(interaction: nextcord.Interaction):
+            self.current[row] = min(max(self.current[row] + step, 0), self.books[row].page_count - 1)
+            self._sync()
+            await interaction.response.edit_message(embeds=self.embeds(), view=self)
+        return callback
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        if self.owner_id is None or interaction.user.id == self.owner_id: return True
+        await interaction.response.send_message(f"Only <@{self.owner_id}> can page these results. Run `/getdxp` yourself to browse them.", ephemeral=True)
+        return False
+
+    def embeds(self) -> list:
+        return [book.render(page) for book, page in zip(self.books, self.current)]
+
+    async def on_timeout(self):
+        for item in self.children: item.disabled = True
+        if self.message:
+            try: await self.message.edit(view=self)
+            except nextcord.HTTPException: pass
+
+class DebouncedEdit:
+    """
+    Coalesces bursts of message-edit requests into at most one edit per `min_interval` seconds.
+    `edit_fn` is an async callable that renders the latest state, so skipped requests lose nothing.
+    """
+    def __init__(self, edit_fn, min_interval: float = EMBED_EDIT_MIN_INTERVAL):
+        self._edit_fn, self._min_interval = edit_fn, min_interval
+        self._last_edit, self._pending = 0.0, None
+        self._editing = False # True once the scheduled edit has been sent, so it must be awaited, not cancelled
+
+    def request(self):
+        if self._pending and not self._pending.done(): return # A scheduled edit will pick up the latest state
+        delay = max(0.0, self._last_edit + self._min_interval - time.monotonic())
+        self._pending = asyncio.get_running_loop().create_task(self._edit_after(delay))
+
+    async def _edit_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self._last_edit, self._editing = time.monotonic(), True
+        try: await self._edit_fn()
+        except nextcord.HTTPException as e: print(f"Warning: Progressive embed edit failed: {e}")
+        finally: self._editing = False
+
+    async def cancel(self):
+        """Drops an edit that is still waiting to be sent and waits for one already sent, so a final edit can't be overwritten."""
+        if self._pending and not self._pending.done():
+            if not self._editing: self._pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError): await self._pending
+
 @bot.slash_command(name="getdxp", description="ADMIN: Retrieves DXP stats for players.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
 async def get_dxp_slash(interaction: nextcord.Interaction,
-    target_user: nextcord.Member = nextcord.SlashOption(name="user", description="Optional: User for specific DXP. Blank for all.", required=False, default=None)
+    target_user: nextcord.Member = nextcord.SlashOption(name="user", description="Optional: User for specific DXP. Blank for all.", required=False, default=None),
+    force: bool = nextcord.SlashOption(description="Optional: Bypass the cache and re-scrape now.", required=False, default=False)
 ):
     if not await is_admin_or_owner_check(interaction):
         await interaction.response.send_message("⛔ You don't have permission.", ephemeral=True); return
@@ -377,7 +2148,19 @@ async def get_dxp_slash(interaction: nextcord.Interaction,
     initial_message = f"Fetching DXP for {target_user.display_name if target_user else 'all registered players'}..."
     await interaction.followup.send(f"⏳ {initial_message} This may take a moment.")
 
-    fetched_player_dxp_results = await fetch_dxp_for_command(bot, target_id_str)
+    progressive_edit, partial_results, progress = None, {}, {'total': 0}
+    if target_user: on_result = None
+    else: # Stream the leaderboard as players finish instead of waiting for the slowest one
+        async def _render_partial():
+            await interaction.edit_original_message(content=f"⏳ Fetched {len(partial_results)}/{progress['total']} players...",
+                                                    embed=build_leaderboard_embed(partial_results, datetime.datetime.now(datetime.timezone.utc), " - in progress"))
+        async def on_result(did_s, entry, total):
+            partial_results[did_s], progress['total'] = entry, total
+            progressive_edit.request()
+        progressive_edit = DebouncedEdit(_render_partial)
+
+    fetched_player_dxp_results = await fetch_dxp_for_command(bot, target_id_str, force=force, on_result=on_result, guild=interaction.guild)
+    if progressive_edit: await progressive_edit.cancel()
 
     if not fetched_player_dxp_results or "error" in fetched_player_dxp_results:
         error_msg = fetched_player_dxp_results.get("error", "No data fetched or no players registered.")
@@ -391,93 +2174,44 @@ async def get_dxp_slash(interaction: nextcord.Interaction,
             await interaction.edit_original_message(content=f"⚠️ Could not display DXP for {target_user.display_name}. Data missing or fetch error."); return
         
         title = f"Event DXP: {player_result['discord_name']} (RSN: {player_result['rsn']})"
-        desc, total_dxp = "", 0
-        dxp_entries = player_result['dxp_data'] if player_result['dxp_data'] else {}
-        for skill, dxp_s in sorted(dxp_entries.items()):
-            if skill.lower() == "overall": continue
-            desc += f"**{skill.capitalize()}**: {_format_dxp_for_display(dxp_s, True)}\n"
-            if dxp_s != NO_DATA_PLACEHOLDER:
-                try: total_dxp += int(dxp_s.replace(" ","").replace(",",""))
-                except: pass
-        desc += f"\n**Total Event DXP (Calculated):** `{total_dxp:,}`"
-        if not dxp_entries or not any(s.lower() != "overall" for s in dxp_entries): desc = "No specific skill DXP data found."
+        desc, record = "", player_result['dxp_data']
+        for skill_id in sorted(record.order, key=SKILL_TABLE.names.__getitem__):
+            if skill_id == OVERALL_SKILL_ID: continue
+            desc += f"**{SKILL_TABLE.names[skill_id].capitalize()}**: {_format_dxp_for_display(record.get(skill_id), True)}\n"
+        desc += f"\n**Total Event DXP (Calculated):** `{record.total():,}`"
+        if not any(skill_id != OVERALL_SKILL_ID for skill_id in record.order): desc = "No specific skill DXP data found."
         
         embed = nextcord.Embed(title=title, description=desc[:4090]+"..." if len(desc)>4096 else desc, color=nextcord.Color.green(), timestamp=utc_now_for_embeds)
+        if player_result.get('fetched_at'): embed.set_footer(text=f"Data fetched {_format_age(time.time() - player_result['fetched_at'])}")
         await interaction.edit_original_message(content=None, embed=embed) # Edit initial message with embed
     
     else: # All players display
-        # Embed 1: Overall DXP Leaderboard
-        leaderboard = []
-        for uid, data in fetched_player_dxp_results.items():
-            if data.get('dxp_data'):
-                total = sum(int(d.replace(" ","").replace(",","")) for s,d in data['dxp_data'].items() if s.lower()!="overall" and d!=NO_DATA_PLACEHOLDER and d.replace(" ","").replace(",","").isdigit())
-                leaderboard.append({'name': data['discord_name'], 'total': total, 'rsn': data['rsn']})
-        leaderboard.sort(key=lambda x:x['total'], reverse=True)
-        desc1 = "\n".join(f"{i+1}. **{e['name']}** ({e['rsn']}): `{e['total']:,}` DXP" for i,e in enumerate(leaderboard))
-        if not desc1: desc1 = "No DXP data for leaderboard."
-        embed1 = nextcord.Embed(title="🏆 Overall DXP Leaderboard (Calculated)", description=desc1[:4090]+"..." if len(desc1)>4096 else desc1, color=nextcord.Color.gold(), timestamp=utc_now_for_embeds)
-        await interaction.edit_original_message(content=None, embed=embed1) # Edit initial message with first embed
-
-        # Embed 2: Skill Best Assignments
-        data_for_skill_best_calc = {data['discord_name']: data['dxp_data'] for discord_id, data in fetched_player_dxp_results.items() if data.get('dxp_data')}
-        
-        # --- Apply SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME ---
-        eligible_for_sb_discord = {}
-        if SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME and SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME.strip():
-            cutoff_name_lower = SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME.strip().lower()
-            # We need a way to get players in their configured order to apply cutoff
-            # For now, this cutoff might be tricky if player_data_store isn't ordered or if discord_name isn't unique
-            # A simple approach: exclude players at or after the cutoff name if found.
-            # This assumes unique discord_names from fetched_player_dxp_results for simplicity of example.
-            # A more robust solution would map PLAYER_SHEET_COLUMN_NAMES (if they are Discord names) to RSNs/Discord IDs.
-            
-            # Simpler filter: iterate through players in the order they are in PLAYER_SHEET_COLUMN_NAMES
-            # and stop if cutoff is reached. This requires PLAYER_SHEET_COLUMN_NAMES to be discord_names
-            # or a mapping. For this example, the current cutoff is based on player *display names*.
-            
-            temp_player_list_for_cutoff = [] # List of (discord_name, data_dict)
-            # Attempt to get a somewhat consistent order for cutoff, though dict iteration isn't guaranteed
-            for p_name_key_in_calc in sorted(data_for_skill_best_calc.keys()): # p_name_key_in_calc is discord_name
-                if p_name_key_in_calc.lower() == cutoff_name_lower:
-                    break # Stop adding players once cutoff is reached
-                temp_player_list_for_cutoff.append((p_name_key_in_calc, data_for_skill_best_calc[p_name_key_in_calc]))
-            
-            if len(temp_player_list_for_cutoff) < len(data_for_skill_best_calc) and \
-               any(p_name.lower() == cutoff_name_lower for p_name in data_for_skill_best_calc.keys()):
-                eligible_for_sb_discord = dict(temp_player_list_for_cutoff)
-                print(f"Info: For Discord Skill Best, considering {len(eligible_for_sb_discord)} players appearing before '{SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME}'.")
-            else: # Cutoff name not found or no one before it
-                print(f"Warning: Cutoff player '{SKILL_BEST_CUTOFF_PLAYER_DISPLAY_NAME}' not effective or not found. Considering all for Discord Skill Best.")
-                eligible_for_sb_discord = data_for_skill_best_calc
-        else:
-            print("Info: No cutoff player for Discord Skill Best. Considering all.")
-            eligible_for_sb_discord = data_for_skill_best_calc
+        # Overall DXP Leaderboard + Skill Best Assignments, computed once and paged through with buttons
+        leaderboard = LeaderboardPages(fetched_player_dxp_results, utc_now_for_embeds)
+        skill_best = build_skill_best_pages(fetched_player_dxp_results, utc_now_for_embeds)
+        view = DxpResultsView(leaderboard, skill_best, owner_id=interaction.user.id)
+        note = None if skill_best else "Could not calculate Skill Best assignments (no eligible players or skills)."
+        view.message = await interaction.edit_original_message(content=note, embeds=view.embeds(), view=view if view.children else None)
 
-        all_skill_names = set(s.lower().strip() for p_data in eligible_for_sb_discord.values() if p_data for s in p_data.keys())
-        
-        if eligible_for_sb_discord and all_skill_names:
-            skill_best_assignments = calculate_skill_best_assignments(eligible_for_sb_discord, list(all_skill_names - {"overall"}))
-            desc2 = ""
-            for skill_l in sorted(list(skill_best_assignments.keys())):
-                bp_name = skill_best_assignments.get(skill_l)
-                if bp_name:
-                    # Find this player's DXP for this skill from eligible_for_sb_discord
-                    bp_dxp_val = NO_DATA_PLACEHOLDER
-                    if bp_name in eligible_for_sb_discord and eligible_for_sb_discord[bp_name]:
-                        # Need to match skill_l (lowercase) with original case key from DXP data
-                        original_skill_key = next((k for k in eligible_for_sb_discord[bp_name].keys() if k.lower().strip() == skill_l), None)
-                        if original_skill_key:
-                            bp_dxp_val = eligible_for_sb_discord[bp_name].get(original_skill_key, NO_DATA_PLACEHOLDER)
-                    
-                    formatted_dxp_val = _format_dxp_for_display(bp_dxp_val, True)
-                    desc2 += f"**{skill_l.capitalize()}**: {bp_name} ({formatted_dxp_val})\n"
-                else: desc2 += f"**{skill_l.capitalize()}**: N/A\n"
-            if not desc2: desc2 = "No Skill Best data to display."
-            if len(desc2) > 4096: desc2 = desc2[:4090] + "\n..."
-            embed2 = nextcord.Embed(title="✨ Skill Best Assignments (Event DXP)", description=desc2, color=nextcord.Color.purple(), timestamp=utc_now_for_embeds)
-            await interaction.followup.send(embed=embed2) # Send as another followup
-        else:
-            await interaction.followup.send("Could not calculate Skill Best assignments (no eligible players or skills).")
+@bot.slash_command(name="dxpgains", description="ADMIN: DXP gained over the last N hours, from stored snapshots.", guild_ids=[TEST_GUILD_ID] if TEST_GUILD_ID else None)
+async def dxp_gains_slash(interaction: nextcord.Interaction,
+    hours: float = nextcord.SlashOption(description="Optional: Look-back window in hours (default 1).", required=False, default=1.0, min_value=0.1)
+):
+    if not await is_admin_or_owner_check(interaction):
+        await interaction.response.send_message("⛔ You don't have permission.", ephemeral=True); return
+    since_ts = time.time() - hours * 3600
+    gains = await asyncio.get_running_loop().run_in_executor(None, SNAPSHOT_STORE.gains_since, since_ts)
+    ranked = sorted(((sum(v for s_name, v in g['gains'].items() if s_name.lower() != "overall"), g) for g in gains.values()), key=lambda x: x[0], reverse=True)
+    lines = []
+    for i, (total, g) in enumerate(ranked):
+        who = f"<@{g['discord_id']}>" if g['discord_id'] else g['rsn']
+        since_note = f" · _since {_format_age(time.time() - g['from'])}_" if g['from'] and g['from'] > since_ts else "" # History shorter than the window
+        lines.append(f"{i+1}. {who} ({g['rsn']}): `{total:,}` DXP{since_note}")
+    desc = "\n".join(lines)
+    if not desc: desc = "No stored snapshots yet. Enable scheduled sweeps or run /getdxp first."
+    if len(desc) > 4096: desc = desc[:4090] + "\n..."
+    embed = nextcord.Embed(title=f"📈 DXP Gained (last {hours:g}h)", description=desc, color=nextcord.Color.blue(), timestamp=datetime.datetime.now(datetime.timezone.utc))
+    await interaction.response.send_message(embed=embed)
 
 # --- Run the Bot ---
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+"""Shared fixtures: makes bot.py and benchmarks/ importable and keeps the bot's logging out of test output."""
+import concurrent.futures
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import bot # noqa: E402
+from fake_runepixels import FakeRunePixelsServer # noqa: E402
+
+@pytest.fixture(autouse=True)
+def quiet_bot(monkeypatch):
+    monkeypatch.setattr(bot, "print", lambda *a, **k: None, raising=False)
+    monkeypatch.setattr(bot, "STATS", bot.BotStats(bot.STATS_WINDOW))
+
+@pytest.fixture
+def make_record():
+    """Builds a one-skill DxpRecord with the given total."""
+    return lambda total: bot.DxpRecord.from_pairs([("Attack", total)])
+
+@pytest.fixture
+def thread_scrapes(monkeypatch):
+    """
+    Runs scrape_player in thread mode on a private thread pool. Call the fixture with a stand-in for
+    fetch_player_dxp (rsn -> (dxp_data, outcome)) to install it.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(bot, "SCRAPE_WORKER_MODE", "thread")
+    monkeypatch.setattr(bot, "SCRAPE_EXECUTOR", executor)
+    yield lambda fetch: monkeypatch.setattr(bot, "fetch_player_dxp", fetch)
+    executor.shutdown()
+
+@pytest.fixture
+def fake_runepixels(monkeypatch):
+    """A local RunePixels stand-in; bot.RUNEPIXELS_BASE_URL points at it for the test."""
+    with FakeRunePixelsServer() as server:
+        monkeypatch.setattr(bot, "RUNEPIXELS_BASE_URL", server.base_url)
+        yield server
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """A throwaway BotRegistry as bot.REGISTRY, with RSN "Zezima" tracked for user 111."""
+    reg = bot.BotRegistry(str(tmp_path / "players.json"), str(tmp_path / "admins.json"))
+    reg.set_player("111", {"rsn": "Zezima"})
+    monkeypatch.setattr(bot, "REGISTRY", reg)
+    return reg
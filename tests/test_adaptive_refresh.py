@@ -0,0 +1,56 @@
+"""AdaptiveRefreshScheduler intervals, budget and circuit breaker, and the scrape cost it is fed."""
+import asyncio
+import time
+
+import pytest
+
+import bot
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(bot, "DXP_CACHE", bot.DxpResultCache(300, 3600, 100))
+    return bot.AdaptiveRefreshScheduler(budget_per_minute=3, min_interval=300, max_interval=3600,
+                                        retry_base=60, breaker_failures=3, breaker_cooldown=3600)
+
+def test_budget_caps_scrapes_per_minute(scheduler):
+    roster = [(str(i), f"R{i}") for i in range(5)]
+    assert len(scheduler.due(roster, now=0)) == 3
+    assert scheduler.due(roster, now=30) == []
+    assert len(scheduler.due(roster, now=61)) == 3
+
+def test_active_players_stay_fast_idle_players_back_off(scheduler, make_record):
+    scheduler.record("Active", make_record(100), now=0)
+    scheduler.record("Idle", make_record(100), now=0)
+    scheduler.record("Active", make_record(200), now=300)
+    scheduler.record("Idle", make_record(100), now=300)
+    scheduler.record("Idle", make_record(100), now=900)
+    assert scheduler._players["active"]["interval"] == 300
+    assert scheduler._players["idle"]["interval"] == 1200
+
+def test_failures_back_off_with_jitter_then_open_the_circuit(scheduler, make_record):
+    scheduler.record("Flaky", None, now=0)
+    assert 30 <= scheduler._players["flaky"]["next_due"] <= 60
+    scheduler.record("Flaky", None, now=100)
+    assert 160 <= scheduler._players["flaky"]["next_due"] <= 220
+    scheduler.record("Flaky", None, now=300)
+    assert scheduler._players["flaky"]["open_until"] == scheduler._players["flaky"]["next_due"] == 3900
+    assert scheduler.due([("1", "Flaky")], now=3000) == []
+    scheduler.record("Flaky", None, now=3900) # Failed probe re-opens straight away
+    assert scheduler._players["flaky"]["open_until"] == 7500
+    scheduler.record("Flaky", make_record(5), now=7500)
+    assert scheduler._players["flaky"]["open_until"] is None and scheduler._players["flaky"]["failures"] == 0
+
+def test_cost_sample_excludes_rate_limit_waits(monkeypatch, make_record, thread_scrapes):
+    class SlowBucket:
+        def acquire(self):
+            time.sleep(0.2); return 0.2
+    def fetch(rsn):
+        bot.acquire_runepixels_token()
+        time.sleep(0.05)
+        return make_record(1), "success"
+    thread_scrapes(fetch)
+    monkeypatch.setattr(bot, "RUNEPIXELS_RATE_LIMITER", SlowBucket())
+    report = {}
+    asyncio.run(bot.scrape_player("P1", report))
+    assert report["outcome"] == "success"
+    assert 0.04 <= report["seconds"] < 0.15
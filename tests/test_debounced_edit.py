@@ -0,0 +1,37 @@
+"""DebouncedEdit: bursts coalesce into one edit, and cancel() never interrupts an edit that was already sent."""
+import asyncio
+
+import bot
+
+def test_burst_of_requests_makes_one_edit():
+    edits = []
+
+    async def edit(): edits.append("edit")
+
+    async def main():
+        debounced = bot.DebouncedEdit(edit, min_interval=0.05)
+        for _ in range(5): debounced.request()
+        await asyncio.sleep(0.01)
+        debounced.request() # Inside min_interval: scheduled, not sent yet
+        await debounced.cancel()
+
+    asyncio.run(main())
+    assert edits == ["edit"]
+
+def test_cancel_waits_for_an_edit_already_sent():
+    log = []
+
+    async def edit():
+        log.append("start")
+        await asyncio.sleep(0.05)
+        log.append("end")
+
+    async def main():
+        debounced = bot.DebouncedEdit(edit, min_interval=0)
+        debounced.request()
+        await asyncio.sleep(0.01) # The edit is now in flight
+        await debounced.cancel()
+        log.append("final edit")
+
+    asyncio.run(main())
+    assert log == ["start", "end", "final edit"]
@@ -0,0 +1,55 @@
+"""DisplayNameResolver: cache order, shared lookups per id, failures, and cancellation of a shared lookup."""
+import asyncio
+
+import bot
+
+class FakeUser:
+    def __init__(self, name): self.display_name = name
+
+class FakeGuild:
+    def __init__(self, members): self.members = members
+    def get_member(self, user_id): return self.members.get(user_id)
+
+class FakeDiscordBot:
+    def __init__(self, guilds=(), delay=0.0, fail=()):
+        self.guilds, self.delay, self.fail, self.fetched = list(guilds), delay, set(fail), []
+    def get_user(self, user_id): return None
+    async def fetch_user(self, user_id):
+        self.fetched.append(user_id)
+        await asyncio.sleep(self.delay)
+        if user_id in self.fail: raise RuntimeError("unknown user")
+        return FakeUser(f"Fetched{user_id}")
+
+def test_member_cache_then_ttl_cache_then_fetch():
+    resolver = bot.DisplayNameResolver(ttl=60, concurrency=2)
+    discord_bot = FakeDiscordBot(guilds=[FakeGuild({1: FakeUser("Member1")})])
+
+    async def main():
+        return [await resolver.resolve(discord_bot, uid) for uid in ["1", "2", "2", "not-an-id"]]
+
+    assert asyncio.run(main()) == ["Member1", "Fetched2", "Fetched2", "not-an-id"]
+    assert discord_bot.fetched == [2]
+    assert resolver.stats == {'member_cache': 1, 'ttl_hit': 1, 'fetched': 1, 'failed': 0}
+
+def test_concurrent_lookups_share_one_fetch_and_failures_fall_back_to_id():
+    resolver = bot.DisplayNameResolver(ttl=60, concurrency=2)
+    discord_bot = FakeDiscordBot(delay=0.01, fail={3})
+    names = asyncio.run(resolver.resolve_many(discord_bot, ["2", "2", "3"]))
+    assert names == {"2": "Fetched2", "3": "3"}
+    assert sorted(discord_bot.fetched) == [2, 3]
+    assert resolver.stats['fetched'] == 1 and resolver.stats['failed'] == 1
+
+def test_cancelled_lookup_releases_callers_that_joined_it():
+    resolver = bot.DisplayNameResolver(ttl=60, concurrency=2)
+    discord_bot = FakeDiscordBot(delay=10)
+
+    async def main():
+        first = asyncio.ensure_future(resolver.resolve(discord_bot, "2"))
+        await asyncio.sleep(0.01)
+        joined = asyncio.ensure_future(resolver.resolve(discord_bot, "2"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(joined, timeout=1)
+
+    assert asyncio.run(main()) == "2"
+    assert resolver._inflight == {}
@@ -0,0 +1,76 @@
+"""ChromeDriverPool with a fake driver factory: reuse, recycling, broken and unhealthy drivers, and failed starts."""
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import bot
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number, self.healthy, self.quit_called = number, True, False
+    def execute_script(self, script):
+        if not self.healthy: raise WebDriverException("chrome not reachable")
+        return 1
+    def quit(self): self.quit_called = True
+
+class FakeFactory:
+    def __init__(self, fail=0):
+        self.drivers, self.fail = [], fail
+    def __call__(self):
+        if self.fail:
+            self.fail -= 1; raise WebDriverException("chromedriver failed to start")
+        self.drivers.append(FakeDriver(len(self.drivers)))
+        return self.drivers[-1]
+
+@pytest.fixture
+def factory(monkeypatch):
+    monkeypatch.setattr(bot, "DRIVER_MAX_PAGES", 3)
+    monkeypatch.setattr(bot, "DRIVER_MAX_MEMORY_MB", None)
+    return FakeFactory()
+
+def use(pool, times=1):
+    for _ in range(times):
+        with pool.driver() as driver: last = driver
+    return last
+
+def test_drivers_are_reused_then_recycled_after_max_pages(factory):
+    pool = bot.ChromeDriverPool(1, driver_factory=factory)
+    first = use(pool, 3)
+    assert len(factory.drivers) == 1 and first.quit_called # Third page hit DRIVER_MAX_PAGES
+    assert use(pool) is not first and len(factory.drivers) == 2
+
+def test_broken_driver_is_replaced_but_timeouts_keep_it(factory):
+    pool = bot.ChromeDriverPool(1, driver_factory=factory)
+    with pytest.raises(TimeoutException):
+        with pool.driver(): raise TimeoutException("slow page")
+    assert not factory.drivers[0].quit_called
+    with pytest.raises(WebDriverException):
+        with pool.driver(): raise WebDriverException("tab crashed")
+    assert factory.drivers[0].quit_called
+    assert use(pool) is factory.drivers[1]
+
+def test_unhealthy_idle_driver_is_replaced_on_checkout(factory):
+    pool = bot.ChromeDriverPool(1, driver_factory=factory)
+    first = use(pool)
+    first.healthy = False
+    assert use(pool) is factory.drivers[1] and first.quit_called
+
+def test_failed_start_releases_the_slot(factory):
+    factory.fail = 1
+    pool = bot.ChromeDriverPool(1, driver_factory=factory)
+    with pytest.raises(WebDriverException): pool.checkout()
+    checked_out = []
+    worker = threading.Thread(target=lambda: checked_out.append(pool.checkout()))
+    worker.start(); worker.join(timeout=1)
+    assert not worker.is_alive() and checked_out[0].driver is factory.drivers[0]
+
+def test_pool_never_exceeds_its_size(factory):
+    pool = bot.ChromeDriverPool(2, driver_factory=factory)
+    held = [pool.checkout(), pool.checkout()]
+    blocked = threading.Thread(target=pool.checkout, daemon=True)
+    blocked.start(); blocked.join(timeout=0.1)
+    assert blocked.is_alive() and len(factory.drivers) == 2
+    pool.checkin(held.pop())
+    blocked.join(timeout=1)
+    assert not blocked.is_alive() and len(factory.drivers) == 2 # The returned driver was reused
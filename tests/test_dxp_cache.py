@@ -0,0 +1,64 @@
+"""DxpResultCache freshness, staleness, eviction and warm-up ordering, and background refresh snapshots."""
+import asyncio
+
+import bot
+
+def test_fresh_then_stale_then_expired(monkeypatch, make_record):
+    cache = bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10)
+    now = [1000.0]
+    monkeypatch.setattr(bot.time, "time", lambda: now[0])
+    cache.put("Zezima", make_record(5))
+    dxp_data, fetched_at = cache.get("  zezima ")
+    assert dxp_data.total() == 5 and cache.is_fresh(fetched_at)
+    now[0] += 50
+    assert cache.get("Zezima") is not None and not cache.is_fresh(cache.get("Zezima")[1])
+    now[0] += 100
+    assert cache.get("Zezima") is None
+
+def test_failed_fetches_are_not_cached():
+    cache = bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10)
+    cache.put("Zezima", None)
+    assert cache.get("Zezima") is None
+
+def test_least_recently_used_entry_is_evicted(make_record):
+    cache = bot.DxpResultCache(ttl=10, max_stale=100, max_entries=2)
+    cache.put("A", make_record(1)); cache.put("B", make_record(2))
+    cache.get("A") # A is now more recent than B
+    cache.put("C", make_record(3))
+    assert cache.get("B") is None and cache.get("A") and cache.get("C")
+
+def test_keep_newer_does_not_overwrite_with_older_snapshot(make_record):
+    cache = bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10)
+    now = bot.time.time()
+    cache.put("A", make_record(200), fetched_at=now - 10)
+    cache.put("A", make_record(100), fetched_at=now - 20, keep_newer=True)
+    assert cache.get("A")[0].total() == 200
+    cache.put("A", make_record(300), fetched_at=now, keep_newer=True)
+    assert cache.get("A")[0].total() == 300
+
+def test_only_one_refresh_per_rsn():
+    cache = bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10)
+    assert cache.begin_refresh("A") and not cache.begin_refresh("a ")
+    cache.end_refresh("A")
+    assert cache.begin_refresh("A")
+
+def test_background_refresh_records_a_snapshot(monkeypatch, tmp_path, make_record):
+    store = bot.DxpSnapshotStore(str(tmp_path / "snapshots.db"))
+    monkeypatch.setattr(bot, "SNAPSHOT_STORE", store)
+    monkeypatch.setattr(bot, "DXP_CACHE", bot.DxpResultCache(10, 100, 10))
+    async def scrape_player(rsn, report=None): return make_record(42)
+    monkeypatch.setattr(bot, "scrape_player", scrape_player)
+    async def main():
+        bot._schedule_background_refresh("123", "Zezima")
+        await asyncio.gather(*bot._background_refresh_tasks)
+    asyncio.run(main())
+    assert bot.DXP_CACHE.get("Zezima")[0].total() == 42
+    snap = store.latest_snapshots()["zezima"]
+    assert snap['dxp_data'].total() == 42
+
+def test_ttl_covers_the_sweep_interval(monkeypatch):
+    monkeypatch.setattr(bot, "DXP_CACHE", bot.DxpResultCache(bot.DXP_CACHE_TTL_SECONDS, bot.DXP_CACHE_MAX_STALE_SECONDS, 10))
+    bot.align_cache_ttl(15 * 60)
+    assert bot.DXP_CACHE.ttl >= 15 * 60 and bot.DXP_CACHE.max_stale >= bot.DXP_CACHE.ttl
+    bot.align_cache_ttl(1) # Never below the configured TTL
+    assert bot.DXP_CACHE.ttl == bot.DXP_CACHE_TTL_SECONDS
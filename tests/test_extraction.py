@@ -0,0 +1,32 @@
+"""Skills-table extraction: the streaming parser against BeautifulSoup on the bundled fixture and on malformed pages."""
+import pytest
+
+import bot
+from fake_runepixels import DEFAULT_FIXTURE
+
+@pytest.fixture(scope="module")
+def page():
+    with open(DEFAULT_FIXTURE, encoding="utf-8") as f: return f.read()
+
+def test_stream_parser_matches_soup_on_fixture(page):
+    expected = bot.parse_dxp_table_soup(page, "Sample")
+    assert expected and set(expected) == set(bot.SKILL_NAMES)
+    assert bot.parse_dxp_table_stream(page, "Sample") == expected
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512])
+def test_stream_parser_is_independent_of_chunking(page, chunk_size):
+    assert bot.parse_dxp_table_stream(page, "Sample", chunk_size=chunk_size) == bot.parse_dxp_table_soup(page, "Sample")
+
+def test_extractor_reads_only_the_first_table_in_app_table():
+    row = "<tr>" + "".join(f"<td>{cell}</td>" for cell in ["Attack", 1, 2, 3, 4, 5, "1,234"]) + "</tr>"
+    other = row.replace("Attack", "Mining")
+    extractor = bot._SkillsTableExtractor()
+    extractor.feed(f"<table>{other}</table><app-table><table><thead><tr><th>Skill</th></tr></thead>"
+                   f"<tbody>{row}<tr><td>Short</td></tr></tbody></table><table>{other}</table></app-table>")
+    assert extractor.done and extractor.rows == [["Attack", "1", "2", "3", "4", "5", "1,234"], ["Short"]]
+    assert bot._dxp_rows_to_dict(extractor.rows) == {"Attack": "1,234"}
+
+@pytest.mark.parametrize("html", ["<html><body>No table</body></html>", "<app-table><div>Loading</div></app-table>"])
+def test_missing_table_gives_none(html):
+    assert bot.parse_dxp_table_stream(html, "Sample") is None
+    assert bot.parse_dxp_table_soup(html, "Sample") is None
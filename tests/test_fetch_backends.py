@@ -0,0 +1,43 @@
+"""Offline tests for the HTTP fetch backend and backend fallback, against benchmarks/fake_runepixels.py."""
+import bot
+
+class StubFetcher:
+    def __init__(self, name, result):
+        self.name, self.result, self.calls = name, result, 0
+    def fetch(self, rsn):
+        self.calls += 1
+        return self.result
+
+def test_http_fetcher_reads_skills_table(fake_runepixels):
+    dxp_data, outcome = bot.HttpDxpFetcher().fetch("Test Player")
+    assert outcome == "success"
+    assert set(dxp_data) == set(bot.SKILL_NAMES)
+    expected = bot.parse_dxp_table_stream(fake_runepixels.template.render("Test Player"), "Test Player")
+    assert dxp_data == expected
+
+def test_http_fetcher_reports_missing_player(fake_runepixels):
+    assert bot.HttpDxpFetcher().fetch("Missing Player") == (None, "not_found")
+
+def test_http_fetcher_reports_connection_errors(monkeypatch):
+    monkeypatch.setattr(bot, "RUNEPIXELS_BASE_URL", "http://127.0.0.1:9") # Discard port: connection refused
+    monkeypatch.setattr(bot, "HTTP_FETCH_RETRIES", 0)
+    assert bot.HttpDxpFetcher().fetch("Test Player") == (None, "error")
+
+def test_not_found_skips_remaining_backends(fake_runepixels, monkeypatch):
+    selenium = StubFetcher("selenium", ({"Attack": "1"}, "success"))
+    monkeypatch.setattr(bot, "FETCHERS", [bot.HttpDxpFetcher(), selenium])
+    assert bot.fetch_player_dxp("Missing Player") == (None, "not_found")
+    assert selenium.calls == 0
+    assert bot.STATS.outcome_totals() == {"error": 1}
+
+def test_falls_back_to_next_backend_and_counts_one_outcome(monkeypatch):
+    monkeypatch.setattr(bot, "FETCHERS", [StubFetcher("http", (None, "no_data")), StubFetcher("selenium", ({"Attack": "1,234"}, "success"))])
+    record, outcome = bot.fetch_player_dxp("Test Player")
+    assert outcome == "success" and record.total() == 1234
+    assert bot.STATS.outcome_totals() == {"success": 1}
+    assert bot.STATS.attempt_totals() == {"http": {"no_data": 1}, "selenium": {"success": 1}}
+
+def test_no_data_from_every_backend_counts_as_error(monkeypatch):
+    monkeypatch.setattr(bot, "FETCHERS", [StubFetcher("http", (None, "no_data")), StubFetcher("selenium", (None, "no_data"))])
+    assert bot.get_player_dxp_data("Test Player") is None
+    assert bot.STATS.outcome_totals() == {"error": 1}
@@ -0,0 +1,37 @@
+"""Content-aware page readiness (wait_for_dxp_ready) against scripted DXP columns."""
+import pytest
+
+import bot
+
+class ScriptedDriver:
+    """Returns each scripted DXP column in turn from execute_script, repeating the last one."""
+    def __init__(self, *columns):
+        self.columns, self.polls = list(columns), 0
+    def execute_script(self, script):
+        self.polls += 1
+        return self.columns[min(self.polls, len(self.columns)) - 1]
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(bot, "READINESS_MODE", "content")
+    monkeypatch.setattr(bot, "READINESS_POLL_INTERVAL", 0.001)
+    monkeypatch.setattr(bot, "READINESS_STABLE_POLLS", 3)
+    monkeypatch.setattr(bot, "READINESS_TIMEOUT", 0.3)
+
+def test_filled_column_is_ready_immediately():
+    assert bot.wait_for_dxp_ready(ScriptedDriver(["1,000", "2,000"]))[1] == "filled"
+
+def test_settled_partial_column_is_ready():
+    driver = ScriptedDriver(["--", "--"], ["1,000", "--"])
+    assert bot.wait_for_dxp_ready(driver)[1] == "stable"
+
+def test_placeholder_skeleton_is_not_stable_before_page_load_delay(monkeypatch):
+    monkeypatch.setattr(bot, "PAGE_LOAD_DELAY", 1)
+    waited, reason = bot.wait_for_dxp_ready(ScriptedDriver(["--", "--", "--"]))
+    assert reason == "timeout" and waited >= 0.3
+
+def test_settled_placeholder_column_is_accepted_after_page_load_delay(monkeypatch):
+    monkeypatch.setattr(bot, "PAGE_LOAD_DELAY", 0.05)
+    monkeypatch.setattr(bot, "READINESS_TIMEOUT", 5)
+    waited, reason = bot.wait_for_dxp_ready(ScriptedDriver(["--", "--", "--"]))
+    assert reason == "stable_empty" and 0.05 <= waited < 5
@@ -0,0 +1,24 @@
+"""BotRegistry's RSN ownership index: one owner per RSN, including registries saved with duplicate RSNs."""
+import json
+
+import bot
+
+def test_rsn_is_not_moved_to_a_second_player(registry):
+    assert registry.claim_players({"222": {"rsn": "zezima"}}) == {"222": "111"}
+    assert registry.get_player("222") is None and registry.find_by_rsn("ZEZIMA") == "111"
+
+def test_changing_rsn_frees_the_old_one(registry):
+    registry.set_player("111", {"rsn": "Woox"})
+    assert registry.find_by_rsn("Zezima") is None and registry.find_by_rsn("Woox") == "111"
+    assert registry.claim_players({"222": {"rsn": "Zezima"}}) == {}
+
+def test_duplicates_in_a_saved_file_keep_an_owner_after_removal(tmp_path):
+    players_file = tmp_path / "players.json"
+    players_file.write_text(json.dumps({"111": {"rsn": "Zezima"}, "222": {"rsn": "zezima"}}))
+    registry = bot.BotRegistry(str(players_file), str(tmp_path / "admins.json"))
+    assert registry.find_by_rsn("Zezima") == "111"
+    registry.remove_player("111")
+    assert registry.find_by_rsn("Zezima") == "222" # Still tracked, so imports can't claim it for a third user
+    assert registry.claim_players({"333": {"rsn": "Zezima"}}) == {"333": "222"}
+    registry.remove_player("222")
+    assert registry.find_by_rsn("Zezima") is None
@@ -0,0 +1,71 @@
+"""/importplayers CSV parsing, the registry write's ownership re-check, and validation outcome categories."""
+import asyncio
+
+import bot
+
+def reasons(rejected):
+    return {line_no: reason for line_no, _, reason in rejected}
+
+def test_parse_accepts_header_and_mentions(registry):
+    entries, rejected = bot.parse_roster_csv("discord_id,rsn\n<@222>, Lynx  Titan \n333,Woox\n")
+    assert entries == {"222": "Lynx Titan", "333": "Woox"} and rejected == []
+
+def test_parse_rejects_bad_and_duplicate_rows(registry):
+    text = "\n".join(["222", "abc,Woox", "222,Bad*Name", "222,Woox", "222,Other", "333,woox", "444,Zezima", "111,Zezima"])
+    entries, rejected = bot.parse_roster_csv(text)
+    assert entries == {"222": "Woox", "111": "Zezima"} # Re-importing your own RSN is fine
+    found = reasons(rejected)
+    assert found[1] == "expected discord_id,rsn"
+    assert found[2] == "not a Discord user ID"
+    assert found[3] == "not a valid RSN"
+    assert found[5] == "Discord ID listed twice"
+    assert found[6] == "RSN also listed on line 4"
+    assert found[7] == "RSN already tracked for <@111>"
+
+def test_parse_caps_rows(registry, monkeypatch):
+    monkeypatch.setattr(bot, "IMPORT_MAX_ROWS", 2)
+    entries, rejected = bot.parse_roster_csv("1,A\n2,B\n3,C\n")
+    assert len(entries) == 2 and "import limit" in rejected[0][2]
+
+def test_claim_players_skips_rsns_claimed_since_parsing(registry):
+    entries, _ = bot.parse_roster_csv("222,Woox\n333,Lynx Titan\n")
+    registry.set_player("999", {"rsn": "woox"}) # e.g. /addplayer while the import was validating
+    conflicts = registry.claim_players({did: {"rsn": rsn} for did, rsn in entries.items()})
+    assert conflicts == {"222": "999"}
+    assert registry.find_by_rsn("Woox") == "999" and registry.find_by_rsn("Lynx Titan") == "333"
+
+def test_validation_separates_not_found_from_could_not_check(monkeypatch, make_record):
+    outcomes = {"Found": "success", "Missing": "not_found", "Flaky": "timeout"}
+
+    async def fake_scrape(rsn, report=None):
+        report['outcome'] = outcomes[rsn]
+        return make_record(1) if outcomes[rsn] == "success" else None
+
+    monkeypatch.setattr(bot, "scrape_player", fake_scrape)
+    monkeypatch.setattr(bot, "DXP_CACHE", bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10))
+    checked = asyncio.run(bot.validate_rsns(list(outcomes)))
+    assert {rsn: outcome for rsn, (_, outcome) in checked.items()} == outcomes
+    assert checked["Found"][0] is not None and checked["Flaky"][0] is None
+
+def test_validation_timeout_marks_pending_rsns_unchecked(monkeypatch, make_record):
+    started = []
+
+    async def slow_scrape(rsn, report=None):
+        started.append(rsn)
+        await asyncio.sleep(0 if rsn == "Quick" else 10)
+        report['outcome'] = "success"
+        return make_record(1)
+
+    monkeypatch.setattr(bot, "scrape_player", slow_scrape)
+    monkeypatch.setattr(bot, "DXP_CACHE", bot.DxpResultCache(ttl=10, max_stale=100, max_entries=10))
+    monkeypatch.setattr(bot, "IMPORT_VALIDATE_CONCURRENCY", 2)
+
+    async def main():
+        checked = await bot.validate_rsns(["Quick", "Slow", "Queued1", "Queued2"], timeout=0.2)
+        await asyncio.sleep(0.05) # Give the cancelled callers' queued slots a chance to start
+        return checked
+
+    checked = asyncio.run(main())
+    assert checked["Quick"][1] == "success"
+    assert all(checked[rsn] == (None, "unchecked") for rsn in ("Slow", "Queued1", "Queued2"))
+    assert "Queued2" not in started # Queued work past the timeout isn't started
@@ -0,0 +1,58 @@
+"""SingleFlight: concurrent calls per key share one execution, and cancelling a caller doesn't cancel the work."""
+import asyncio
+
+import pytest
+
+import bot
+
+def test_concurrent_calls_share_one_execution():
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"result-{key}"
+
+    async def main():
+        flights = bot.SingleFlight()
+        results = await asyncio.gather(*(flights.run(key, lambda key=key: work(key)) for key in ["a", "a", "a", "b"]))
+        return flights, results
+
+    flights, results = asyncio.run(main())
+    assert sorted(calls) == ["a", "b"]
+    assert [result for result, _ in results] == ["result-a", "result-a", "result-a", "result-b"]
+    assert [joined for _, joined in results] == [False, True, True, False]
+    assert flights.stats == {'started': 2, 'joined': 2}
+    assert flights._inflight == {} # Finished keys start a fresh call next time
+
+def test_errors_reach_every_caller():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        flights = bot.SingleFlight()
+        return await asyncio.gather(flights.run("a", fail), flights.run("a", fail), return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(main())] == ["boom", "boom"]
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return "done"
+
+    async def main():
+        flights = bot.SingleFlight()
+        first = asyncio.ensure_future(flights.run("a", work))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flights.run("a", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError): await first
+        return await second
+
+    assert asyncio.run(main()) == ("done", True)
+    assert finished == [True]
@@ -0,0 +1,44 @@
+"""Skill Best solver: hand-built cases, and the "indexed" solver against the original "v13" logic on randomized rosters."""
+import random
+
+import pytest
+
+import bot
+from bench_skill_best import random_roster, solve
+
+SOLVERS = [bot.calculate_skill_best_assignments_v13, bot.calculate_skill_best_assignments_indexed]
+
+@pytest.mark.parametrize("solver", SOLVERS, ids=["v13", "indexed"])
+def test_top_player_is_capped_and_the_rest_roll_down(solver, monkeypatch):
+    monkeypatch.setattr(bot, "MAX_SKILLS_FOR_BEST_PLAYER", 1)
+    roster = {"Alice": {"Attack": "500", "Strength": "400", "Magic": "300"},
+              "Bob": {"Attack": "60", "Strength": "60", "Magic": "50"},
+              "Carol": {"Attack": "10", "Strength": "10", "Magic": "10"}}
+    assert solve(solver, roster) == {"attack": "Alice", "strength": "Bob", "magic": "Carol"}
+
+@pytest.mark.parametrize("solver", SOLVERS, ids=["v13", "indexed"])
+def test_overall_and_placeholders_are_ignored(solver):
+    roster = {"Alice": {"Overall": "9,999", "Attack": bot.NO_DATA_PLACEHOLDER, "Mining": "1,000"},
+              "Bob": {"Overall": "10", "Attack": "10", "Mining": "5"}}
+    assert solve(solver, roster) == {"mining": "Alice", "attack": "Bob"}
+
+@pytest.mark.parametrize("solver", SOLVERS, ids=["v13", "indexed"])
+def test_a_player_with_a_free_slot_outranks_a_lower_one(solver, monkeypatch):
+    monkeypatch.setattr(bot, "MAX_SKILLS_FOR_BEST_PLAYER", 1)
+    roster = {"Alice": {"Attack": "100", "Mining": "90"}, "Bob": {"Attack": "80", "Mining": "10"}, "Carol": {"Mining": "50"}}
+    assert solve(solver, roster) == {"attack": "Alice", "mining": "Carol"}
+
+@pytest.mark.parametrize("solver", SOLVERS, ids=["v13", "indexed"])
+def test_no_numeric_data(solver):
+    assert solve(solver, {}) == {}
+    assert solve(solver, {"Alice": {"Attack": bot.NO_DATA_PLACEHOLDER, "Overall": "5"}}) == {}
+
+@pytest.mark.parametrize("max_skills", [1, 2, 3, 5])
+@pytest.mark.parametrize("seed", range(10))
+def test_indexed_matches_v13_on_random_rosters(seed, max_skills, monkeypatch):
+    monkeypatch.setattr(bot, "MAX_SKILLS_FOR_BEST_PLAYER", max_skills)
+    rng = random.Random(seed)
+    for _ in range(15):
+        # Small DXP ranges produce ties; names containing skill names exercise a v13 quirk
+        roster = random_roster(rng, rng.randint(1, 40), dxp_range=rng.choice([5, 50, 5_000_000]))
+        assert solve(bot.calculate_skill_best_assignments_indexed, roster) == solve(bot.calculate_skill_best_assignments_v13, roster)
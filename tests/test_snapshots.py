@@ -0,0 +1,36 @@
+"""DxpSnapshotStore: latest snapshot per player and the DXP gained over a window (/dxpgains)."""
+import pytest
+
+import bot
+
+def pairs(**dxp):
+    return bot.DxpRecord.from_pairs(list(dxp.items()))
+
+@pytest.fixture
+def store(tmp_path):
+    store = bot.DxpSnapshotStore(str(tmp_path / "snapshots.db"))
+    # Old: snapshots at 100, 200 and 300. New: history starts at 250. Placeholder: Mining was "--" at first.
+    store.record_sweep(100, [("1", "Old", pairs(Attack=10, Mining=5), 100)])
+    store.record_sweep(200, [("1", "Old", pairs(Attack=40, Mining=5), 200)])
+    store.record_sweep(250, [("2", "New", pairs(Attack=7), 250), ("3", "Placeholder", pairs(Attack=1, Mining=None), 250)])
+    store.record_sweep(300, [("1", "Old", pairs(Attack=100, Mining=25), 300), ("2", "New", pairs(Attack=17), 300),
+                             ("3", "Placeholder", pairs(Attack=6, Mining=50), 300)])
+    return store
+
+def test_latest_snapshot_per_player(store):
+    latest = store.latest_snapshots()
+    assert {key: entry['taken_at'] for key, entry in latest.items()} == {"old": 300, "new": 300, "placeholder": 300}
+    assert latest["old"]['dxp_data'].total() == 125 and latest["old"]['discord_id'] == "1"
+
+def test_gains_from_last_snapshot_before_the_window(store):
+    old = store.gains_since(250)["old"]
+    assert (old['from'], old['to']) == (200, 300) # Not the older snapshot at 100
+    assert old['gains'] == {"Attack": 60, "Mining": 20}
+
+def test_history_shorter_than_the_window_uses_the_first_snapshot(store):
+    new = store.gains_since(150)["new"]
+    assert (new['from'], new['to'], new['gains']) == (250, 300, {"Attack": 10})
+
+def test_skill_without_an_earlier_number_has_no_gain(store):
+    placeholder = store.gains_since(250)["placeholder"]
+    assert placeholder['gains'] == {"Attack": 5} # Mining was "--" in the base snapshot